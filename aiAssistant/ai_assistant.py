@@ -1,27 +1,40 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import re
 import json
 import asyncio
 import qasync
 import argparse
+import anyio
+import httpx
+from contextlib import AsyncExitStack
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, 
                            QHBoxLayout, QWidget, QTextEdit, QLineEdit, 
                            QPushButton, QSplitter, QMessageBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QTextCharFormat, QColor, QTextCursor
-from openai import OpenAI
+from openai import AsyncOpenAI
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    # orjson is optional, fall back to the standard library parser
+    json_loads = json.loads
+
 # --- Configuration and API Key --- #
 
+_API_KEY_RE = re.compile(r'OpenAI\s*=\s*"([^"]+)"')
+
 def read_api_key_from_config(config_path='./config.dat'):
     try:
         with open(config_path, 'r') as config_file:
             content = config_file.read()
-            match = re.search(r'OpenAI\s*=\s*"([^"]+)"', content)
+            match = _API_KEY_RE.search(content)
             if match:
                 return match.group(1)
             else:
@@ -34,31 +47,123 @@ def read_api_key_from_config(config_path='./config.dat'):
         print(f"Error reading config file: {str(e)}")
         return None
 
+def create_http_client():
+    """Create the pooled HTTP client shared by every OpenAI request.
+
+    Idle connections are kept long enough to survive a round of MCP tool calls,
+    so the follow-up completion reuses the connection of the first one.
+    HTTP/2 is used when the optional h2 package is installed.
+    """
+    limits = httpx.Limits(max_keepalive_connections=5, keepalive_expiry=120)
+    try:
+        return httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:
+        return httpx.AsyncClient(limits=limits)
+
 API_KEY = read_api_key_from_config()
 if API_KEY:
-    OPENAI_CLIENT = OpenAI(api_key=API_KEY)
+    OPENAI_CLIENT = AsyncOpenAI(api_key=API_KEY, http_client=create_http_client())
 else:
     OPENAI_CLIENT = None
 
 # --- MCP Client Functions --- #
 
+MCP_SERVER_URL = "http://localhost:8000/sse"
+
+# Errors raised by a session whose SSE connection has gone away
+_DROPPED_CONNECTION_ERRORS = (ConnectionError, EOFError,
+                              anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+class MCPConnectionManager:
+    """Keeps one MCP client session open and shares it between tool calls"""
+
+    def __init__(self, server_url):
+        self.server_url = server_url
+        self._loop = None
+        self._lock = None
+        self._session = None
+        self._runner = None
+        self._closing = None
+
+    async def get_session(self):
+        """Return the shared session, connecting and initializing it on first use"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Sessions and locks are bound to the loop that created them
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._session = None
+            self._runner = None
+        async with self._lock:
+            if self._session is None:
+                ready = loop.create_future()
+                self._closing = asyncio.Event()
+                self._runner = asyncio.ensure_future(self._hold_connection(ready, self._closing))
+                self._session = await ready
+            return self._session
+
+    async def _hold_connection(self, ready, closing):
+        """Open the SSE connection and keep it open until closing is set.
+
+        The connection is entered and exited from this one task because the
+        underlying anyio task groups must be left from the task that entered them.
+        """
+        try:
+            async with AsyncExitStack() as stack:
+                read_stream, write_stream = await stack.enter_async_context(sse_client(self.server_url))
+                session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+                await session.initialize()
+                ready.set_result(session)
+                await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+
+    async def reconnect(self, stale_session):
+        """Replace a session whose connection dropped and return a fresh one.
+
+        Concurrent callers that saw the same stale session share one reconnect.
+        """
+        if self._session is stale_session:
+            await self.close()
+        return await self.get_session()
+
+    async def close(self):
+        """Close the shared session if one is open"""
+        runner = self._runner
+        if runner is None:
+            return
+        self._session = None
+        self._runner = None
+        self._closing.set()
+        try:
+            await runner
+        except Exception:
+            pass
+
+MCP_CONNECTION = MCPConnectionManager(MCP_SERVER_URL)
+
 async def call_mcp_tool(tool_name: str, arguments: dict):
-    mcp_server_url = "http://localhost:8000/sse"
     try:
-        async with sse_client(mcp_server_url) as (read_stream, write_stream):
-            async with ClientSession(read_stream, write_stream) as session:
-                await session.initialize()
-                result = await session.call_tool(tool_name, arguments=arguments)
-                if result.content and isinstance(result.content, list) and result.content[0].text:
-                    return result.content[0].text
-                return "Tool executed, but no specific text content returned."
+        session = await MCP_CONNECTION.get_session()
+        try:
+            result = await session.call_tool(tool_name, arguments=arguments)
+        except _DROPPED_CONNECTION_ERRORS:
+            # The server went away since the last call, reconnect once and retry
+            session = await MCP_CONNECTION.reconnect(session)
+            result = await session.call_tool(tool_name, arguments=arguments)
+        if result.content and isinstance(result.content, list) and result.content[0].text:
+            return result.content[0].text
+        return "Tool executed, but no specific text content returned."
     except ConnectionRefusedError:
-        return f"Error: Could not connect to MCP Server at {mcp_server_url}. Is it running?"
+        return f"Error: Could not connect to MCP Server at {MCP_SERVER_URL}. Is it running?"
     except Exception as e:
         return f"Error calling MCP tool '{tool_name}': {str(e)}"
 
 # --- OpenAI Chatbot Logic --- #
 
+MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+
 SYSTEM_PROMPT = ("You are a helpful file search assistant that can help users find information about scanned directories. Directories are also refered to as paths. "
                  "You have access to six main tools: "
                  "1. 'get_available_directories' - Lists all available scanned top level directories "
@@ -177,88 +282,125 @@ class ChatMessage:
         self.content = content
         self.message_type = message_type  # normal, tool_call, tool_response, error
 
-class ChatWorker(QThread):
-    message_received = pyqtSignal(str, str, str)  # sender, content, type
+async def stream_completion(emit, **kwargs):
+    """Stream a chat completion, emitting content deltas as they arrive.
+
+    Returns the assistant message as a dict, with any tool calls assembled
+    from their streamed fragments.
+    """
+    stream = await OPENAI_CLIENT.chat.completions.create(stream=True, **kwargs)
+    content_parts = []
+    tool_calls = {}  # stream index -> tool call being assembled
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content_parts.append(delta.content)
+            emit("Bot", delta.content, "stream")
+        for tool_call_delta in delta.tool_calls or []:
+            # Only the first fragment of each call carries its id and name
+            tool_call = tool_calls.setdefault(tool_call_delta.index, {
+                "id": None,
+                "type": "function",
+                "function": {"name": "", "arguments": ""}
+            })
+            if tool_call_delta.id:
+                tool_call["id"] = tool_call_delta.id
+            if tool_call_delta.function:
+                if tool_call_delta.function.name:
+                    tool_call["function"]["name"] += tool_call_delta.function.name
+                if tool_call_delta.function.arguments:
+                    tool_call["function"]["arguments"] += tool_call_delta.function.arguments
     
-    def __init__(self, user_input, message_history):
-        super().__init__()
-        self.user_input = user_input
-        self.message_history = message_history.copy()
+    message = {"role": "assistant", "content": "".join(content_parts) or None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+    return message
+
+async def process_message(user_input, message_history, emit):
+    """Run one user message through OpenAI and the MCP tools.
+
+    Progress is reported through emit(sender, content, type) and message_history
+    is extended in place. If the turn fails, the history is rolled back to where it
+    started, so it never keeps tool calls without their responses.
+    """
+    turn_start = len(message_history)
+    try:
+        message_history.append({"role": "user", "content": user_input})
         
-    def run(self):
-        asyncio.set_event_loop(asyncio.new_event_loop())
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self.process_message())
+        message = await stream_completion(
+            emit,
+            model=MODEL,
+            messages=message_history,
+            tools=TOOLS_DEFINITION,
+            tool_choice="auto"
+        )
+        message_history.append(message)
         
-    async def process_message(self):
-        try:
-            self.message_history.append({"role": "user", "content": self.user_input})
+        if message.get("tool_calls"):
+            emit("Bot", "Let me check that for you...", "normal")
             
-            response = OPENAI_CLIENT.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=self.message_history,
-                tools=TOOLS_DEFINITION,
-                tool_choice="auto"
-            )
+            tool_calls = message["tool_calls"]
+            calls = []
+            for tool_call in tool_calls:
+                function_name = tool_call["function"]["name"]
+                function_args = json_loads(tool_call["function"]["arguments"] or "{}")
+                calls.append((function_name, function_args))
+                
+                tool_call_info = f"Calling: {function_name}({function_args})"
+                emit("Tool", tool_call_info, "tool_call")
             
-            message = response.choices[0].message
-            self.message_history.append(message)
+            # Call MCP server for all tool calls concurrently
+            tool_results = await asyncio.gather(
+                *(call_mcp_tool(function_name, function_args) for function_name, function_args in calls),
+                return_exceptions=True)
             
-            if message.tool_calls:
-                self.message_received.emit("Bot", "Let me check that for you...", "normal")
+            # Report results and extend the history in the original call order
+            for tool_call, (function_name, _), tool_result in zip(tool_calls, calls, tool_results):
+                if isinstance(tool_result, Exception):
+                    tool_result = f"Error calling MCP tool '{function_name}': {str(tool_result)}"
                 
-                for tool_call in message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    tool_call_info = f"Calling: {function_name}({function_args})"
-                    self.message_received.emit("Tool", tool_call_info, "tool_call")
-                    
-                    # Call MCP server
-                    tool_result = await call_mcp_tool(function_name, function_args)
-                    
-                    # Format SQL query results nicely
-                    if function_name == "run_sql_query":
-                        try:
-                            result_data = json.loads(tool_result)
-                            if result_data.get("status") == "success":
-                                tool_response_info = f"Query returned {result_data.get('row_count', 0)} rows"
-                                if "note" in result_data:
-                                    tool_response_info += f" ({result_data['note']})"
-                            else:
-                                tool_response_info = f"Result: {tool_result}"
-                        except:
+                # Format SQL query results nicely
+                if function_name == "run_sql_query":
+                    try:
+                        result_data = json_loads(tool_result)
+                        if result_data.get("status") == "success":
+                            tool_response_info = f"Query returned {result_data.get('row_count', 0)} rows"
+                            if "note" in result_data:
+                                tool_response_info += f" ({result_data['note']})"
+                        else:
                             tool_response_info = f"Result: {tool_result}"
-                    else:
+                    except:
                         tool_response_info = f"Result: {tool_result}"
-                        
-                    self.message_received.emit("Tool", tool_response_info, "tool_response")
+                else:
+                    tool_response_info = f"Result: {tool_result}"
                     
-                    self.message_history.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": function_name,
-                        "content": str(tool_result)
-                    })
-                
-                # Get follow-up response
-                follow_up_response = OPENAI_CLIENT.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=self.message_history
-                )
-                final_message = follow_up_response.choices[0].message.content
-                self.message_history.append(follow_up_response.choices[0].message)
-                self.message_received.emit("Bot", final_message, "normal")
-                
-            else:
-                bot_reply = message.content
-                self.message_received.emit("Bot", bot_reply, "normal")
+                emit("Tool", tool_response_info, "tool_response")
                 
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            self.message_received.emit("Error", error_msg, "error")
+                message_history.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call["id"],
+                    "name": function_name,
+                    "content": str(tool_result)
+                })
+            
+            # Get follow-up response
+            follow_up_message = await stream_completion(
+                emit,
+                model=MODEL,
+                messages=message_history
+            )
+            message_history.append(follow_up_message)
+            
+    except Exception as e:
+        del message_history[turn_start:]
+        error_msg = f"Error: {str(e)}"
+        emit("Error", error_msg, "error")
 
 class FileSearchChatbot(QMainWindow):
+    message_received = pyqtSignal(str, str, str)  # sender, content, type
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("File Search Chatbot")
@@ -271,6 +413,14 @@ class FileSearchChatbot(QMainWindow):
             
         self.message_history = [{"role": "system", "content": SYSTEM_PROMPT}]
         self.pending_command = None  # For storing the last batch command to show in UI
+        self._task = None  # Message currently being processed on the event loop
+        self._streaming = False  # True while a streamed bot reply is being appended
+        self._pending = []  # (sender, content, type) waiting for the next flush
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(33)
+        self._flush_timer.timeout.connect(self._flush)
+        self.message_received.connect(self.on_message_received)
         self.setup_ui()
         self.add_message("Bot", "Hello! I can help you search for information about scanned directories and databases. What would you like to know?", "normal")
     
@@ -279,8 +429,8 @@ class FileSearchChatbot(QMainWindow):
         try:
             self.message_history.append({"role": "user", "content": user_input})
             
-            response = OPENAI_CLIENT.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = await OPENAI_CLIENT.chat.completions.create(
+                model=MODEL,
                 messages=self.message_history,
                 tools=TOOLS_DEFINITION,
                 tool_choice="auto"
@@ -290,13 +440,17 @@ class FileSearchChatbot(QMainWindow):
             self.message_history.append(message)
             
             if message.tool_calls:
-                for tool_call in message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    # Call MCP server
-                    tool_result = await call_mcp_tool(function_name, function_args)
-                    
+                calls = [(tool_call.function.name, json_loads(tool_call.function.arguments))
+                         for tool_call in message.tool_calls]
+                
+                # Call MCP server for all tool calls concurrently
+                tool_results = await asyncio.gather(
+                    *(call_mcp_tool(function_name, function_args) for function_name, function_args in calls),
+                    return_exceptions=True)
+                
+                for tool_call, (function_name, _), tool_result in zip(message.tool_calls, calls, tool_results):
+                    if isinstance(tool_result, Exception):
+                        tool_result = f"Error calling MCP tool '{function_name}': {str(tool_result)}"
                     self.message_history.append({
                         "role": "tool",
                         "tool_call_id": tool_call.id,
@@ -305,8 +459,8 @@ class FileSearchChatbot(QMainWindow):
                     })
                 
                 # Get follow-up response
-                follow_up_response = OPENAI_CLIENT.chat.completions.create(
-                    model="gpt-3.5-turbo",
+                follow_up_response = await OPENAI_CLIENT.chat.completions.create(
+                    model=MODEL,
                     messages=self.message_history
                 )
                 self.message_history.append(follow_up_response.choices[0].message)
@@ -393,8 +547,35 @@ class FileSearchChatbot(QMainWindow):
         self.error_format.setFontWeight(QFont.Bold)
         
     def add_message(self, sender, content, message_type):
+        # Keep ordering with any messages still waiting to be flushed
+        self._pending.append((sender, content, message_type))
+        self._flush()
+        
+    def _flush(self):
+        """Write all pending messages to the chat display in one edit block"""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        
         cursor = self.chat_display.textCursor()
         cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for sender, content, message_type in pending:
+            self._insert_message(cursor, sender, content, message_type)
+        cursor.endEditBlock()
+        self.chat_display.setTextCursor(cursor)
+        self.chat_display.ensureCursorVisible()
+        
+    def _insert_message(self, cursor, sender, content, message_type):
+        # Streamed deltas are appended to the bot block they started
+        if message_type == "stream":
+            if not self._streaming:
+                cursor.insertText(f"{sender}: ", self.bot_format)
+                self._streaming = True
+            cursor.insertText(content, QTextCharFormat())
+            return
+        self._end_stream(cursor)
         
         # Choose format based on sender and type
         if sender == "User":
@@ -422,8 +603,12 @@ class FileSearchChatbot(QMainWindow):
             cursor.insertText(f"{content}\n", normal_format)
             
         cursor.insertText("\n")
-        self.chat_display.setTextCursor(cursor)
-        self.chat_display.ensureCursorVisible()
+        
+    def _end_stream(self, cursor):
+        """Close the bot block of a streamed reply, if one is open"""
+        if self._streaming:
+            cursor.insertText("\n\n")
+            self._streaming = False
         
     def send_message(self):
         user_input = self.input_field.text().strip()
@@ -438,18 +623,25 @@ class FileSearchChatbot(QMainWindow):
         self.input_field.setEnabled(False)
         self.send_button.setEnabled(False)
         
-        # Start worker thread for chat processing
-        self.worker = ChatWorker(user_input, self.message_history)
-        self.worker.message_received.connect(self.on_message_received)
-        self.worker.finished.connect(self.on_processing_finished)
-        self.worker.start()
+        # Process the message on the shared qasync event loop; it runs on the GUI
+        # thread, so it can extend the history directly
+        self._task = asyncio.ensure_future(
+            process_message(user_input, self.message_history, self.message_received.emit))
+        self._task.add_done_callback(self.on_processing_finished)
         
     def on_message_received(self, sender, content, message_type):
-        self.add_message(sender, content, message_type)
+        # Buffer messages and write them at most ~30 times a second
+        self._pending.append((sender, content, message_type))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
         
-    def on_processing_finished(self):
-        # Update message history with the worker's updated history
-        self.message_history = self.worker.message_history
+    def on_processing_finished(self, task):
+        self._task = None
+        self._flush()
+        cursor = self.chat_display.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        self._end_stream(cursor)
+        self.chat_display.setTextCursor(cursor)
         
         # Re-enable input
         self.input_field.setEnabled(True)
@@ -463,6 +655,8 @@ def main():
     args = parser.parse_args()
     
     app = QApplication(sys.argv)
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
     
     if not API_KEY:
         QMessageBox.critical(None, "Startup Error", 
@@ -475,13 +669,8 @@ def main():
     if args.batch:
         commands = args.batch.split(';')
         
-        # Set up async event loop for batch processing
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         # Process commands silently
         loop.run_until_complete(window.process_batch_commands(commands))
-        loop.close()
     
     window.show()
     
@@ -489,7 +678,10 @@ def main():
     if hasattr(window, 'pending_command') and window.pending_command:
         QTimer.singleShot(100, window.process_pending_command)  # Delay slightly for GUI to fully render
     
-    sys.exit(app.exec_())
+    with loop:
+        loop.run_forever()
+        loop.run_until_complete(MCP_CONNECTION.close())
+        loop.run_until_complete(OPENAI_CLIENT.close())
 
 if __name__ == "__main__":
     main()
@@ -1,238 +1,402 @@
 #!/usr/bin/env python3
 
 import os
+import sys
+import stat
+import queue
+import atexit
+import logging
+import logging.handlers
+import asyncio
 import sqlite3
 import json
 import platform
 import subprocess
+import shlex
+from functools import lru_cache
+from urllib.request import pathname2url
 from mcp.server.fastmcp import FastMCP as MCDPServer, Context as ToolContext
 
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    # orjson is optional, fall back to the standard library encoder
+    json_dumps = json.dumps
+
+logger = logging.getLogger("mcp")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+def setup_logging():
+    """Route log records through a queue so tool calls only enqueue them.
+
+    A background QueueListener does the formatting and the writes to stdout.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("[MCP Server] %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
 # Create the server instance first
 # Tools will be registered to this instance via decorators
 server = MCDPServer(name="dirscanInterfaceServer")
 
+@lru_cache(maxsize=128)
+def _load_metadata(db: str, mtime_ns: int) -> str:
+    """Reads a database's metadata JSON. mtime_ns keys the cache so edits invalidate it."""
+    with open(f"../dirscans/{db}.json", "r") as f:
+        return f.read()
+
 @server.tool()
 async def get_db_metadata(ctx: ToolContext, db: str) -> str:
     """Returns metadata about a database."""
-    print(f"[MCP Server] Tool call: get_db_metadata, db: {db}")
+    logger.info("Tool call: get_db_metadata, db: %s", db)
     try:
         # check if db.json exists in the same directory as the db
-        if os.path.exists(f"../dirscans/{db}.json"):
-            with open(f"../dirscans/{db}.json", "r") as f:
-                return f.read()
-        else:
+        try:
+            mtime_ns = os.stat(f"../dirscans/{db}.json").st_mtime_ns
+        except FileNotFoundError:
             return f"Error: {db}.json does not exist in ../dirscans"
+        return _load_metadata(db, mtime_ns)
     except Exception as e:
-        print(f"[MCP Server] Error getting metadata for {db}: {e}")
+        logger.error("Error getting metadata for %s: %s", db, e)
         return f"Error getting metadata: {str(e)}"
 
+# db name -> (mtime_ns, connection) kept open across run_sql_query calls
+_conn_pool = {}
+# db name -> asyncio.Lock serializing use of that db's pooled connection
+_conn_locks = {}
+
+def _open_connection(db_path):
+    """Opens a read-only connection tuned for repeated queries.
+
+    immutable=1 lets SQLite skip file locking and change detection. That is safe
+    because _get_connection reopens the connection whenever the file's mtime changes.
+    """
+    uri = f"file:{pathname2url(db_path)}?mode=ro&immutable=1"
+    # The connection keeps prepared statements keyed by SQL text, so a repeated
+    # query skips parsing and planning; size it like the result cache.
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                           cached_statements=256)
+    conn.executescript("""
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+        PRAGMA temp_store=MEMORY;
+    """)
+    return conn
+
+def _get_connection(db, db_path, mtime_ns):
+    """Returns the pooled connection for db, reopening it if the file was rewritten."""
+    pooled = _conn_pool.get(db)
+    if pooled is not None:
+        if pooled[0] == mtime_ns:
+            return pooled[1]
+        pooled[1].close()
+    conn = _open_connection(db_path)
+    _conn_pool[db] = (mtime_ns, conn)
+    return conn
+
+@atexit.register
+def _close_connections():
+    for _, conn in _conn_pool.values():
+        conn.close()
+    _conn_pool.clear()
+
+# Queries that can be wrapped in an outer SELECT so SQLite stops after the rows we return
+_LIMITABLE_PREFIXES = ("select", "with")
+
+def _statement_body(query):
+    """Returns query without surrounding comments, whitespace and trailing semicolons.
+
+    Returns None if query holds more than one statement. Quoted strings and
+    identifiers are skipped, so semicolons and comment markers inside them count
+    as text.
+    """
+    start = end = None
+    semicolon = False
+    i, n = 0, len(query)
+    while i < n:
+        c = query[i]
+        if query.startswith("--", i):
+            j = query.find("\n", i)
+            i = n if j < 0 else j + 1
+            continue
+        if query.startswith("/*", i):
+            j = query.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+            continue
+        if c == ";":
+            semicolon = True
+            i += 1
+            continue
+        if c.isspace():
+            i += 1
+            continue
+        # Any other text after a semicolon starts a second statement
+        if semicolon:
+            return None
+        if start is None:
+            start = i
+        if c in "'\"`[":
+            j = query.find("]" if c == "[" else c, i + 1)
+            i = n if j < 0 else j + 1
+        else:
+            i += 1
+        end = i
+    return query[start:end] if start is not None else ""
+
+def _limit_query(query, limit):
+    """Wraps a single SELECT/WITH query so SQLite produces at most limit rows."""
+    body = _statement_body(query)
+    if body is not None and body.lower().startswith(_LIMITABLE_PREFIXES):
+        # Newlines keep a -- comment inside the query from swallowing the closing parenthesis
+        return f"SELECT * FROM (\n{body}\n) LIMIT {limit}"
+    return query
+
+@lru_cache(maxsize=256)
+def _run_and_format(db, db_path, mtime_ns, query):
+    """Runs query on the pooled connection and formats the results as a JSON string.
+
+    mtime_ns is part of the cache key, so a rescanned database never serves stale results.
+    """
+    conn = _get_connection(db, db_path, mtime_ns)
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    try:
+        # Execute the query, asking for one extra row to detect truncation
+        cursor.execute(_limit_query(query, 101))
+        
+        # Get column names
+        column_names = [description[0] for description in cursor.description] if cursor.description else []
+        
+        # Fetch at most 101 rows, even for statements that could not be wrapped in a LIMIT
+        results = cursor.fetchmany(101)
+    finally:
+        cursor.close()
+    
+    # Format results as JSON for easy parsing
+    if not results:
+        return "Query executed successfully but returned no results."
+    
+    # Limit to first 100 rows for safety
+    truncated = len(results) > 100
+    formatted_results = [dict(row) for row in results[:100]]
+    
+    # Return JSON string with metadata
+    response = {
+        "status": "success",
+        "row_count": len(formatted_results),
+        "columns": column_names,
+        "results": formatted_results
+    }
+    
+    if truncated:
+        response["note"] = "Results may be truncated to first 100 rows"
+    
+    return json_dumps(response)
+
 @server.tool()
 async def run_sql_query(ctx: ToolContext, db: str, query: str) -> str:
     """Executes a SQL query on the specified database and returns the results."""
-    print(f"[MCP Server] Tool call: run_sql_query, db: {db}, query: {query}")
+    logger.info("Tool call: run_sql_query, db: %s, query: %s", db, query)
     try:
         db_path = f"../dirscans/{db}.sqlite3"
-        if not os.path.exists(db_path):
+        try:
+            mtime_ns = os.stat(db_path).st_mtime_ns
+        except FileNotFoundError:
             return f"Error: Database {db}.sqlite3 does not exist in ../dirscans"
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Execute the query
-        cursor.execute(query)
-        
-        # Get column names
-        column_names = [description[0] for description in cursor.description] if cursor.description else []
-        
-        # Fetch results
-        results = cursor.fetchall()
-        conn.close()
-        
-        # Format results as JSON for easy parsing
-        if not results:
-            return "Query executed successfully but returned no results."
-        
-        # Convert results to list of dictionaries
-        formatted_results = []
-        for row in results:
-            row_dict = {}
-            for i, value in enumerate(row):
-                row_dict[column_names[i]] = value
-            formatted_results.append(row_dict)
-        
-        # Return JSON string with metadata
-        response = {
-            "status": "success",
-            "row_count": len(results),
-            "columns": column_names,
-            "results": formatted_results[:100]  # Limit to first 100 rows for safety
-        }
-        
-        if len(results) > 100:
-            response["note"] = f"Results limited to first 100 rows. Total rows: {len(results)}"
-        
-        return json.dumps(response, indent=2)
+        async with _conn_locks.setdefault(db, asyncio.Lock()):
+            return _run_and_format(db, db_path, mtime_ns, query)
         
     except sqlite3.Error as e:
-        print(f"[MCP Server] SQL Error: {e}")
+        logger.error("SQL Error: %s", e)
         return f"SQL Error: {str(e)}"
     except Exception as e:
-        print(f"[MCP Server] Error running SQL query: {e}")
+        logger.error("Error running SQL query: %s", e)
         return f"Error running SQL query: {str(e)}"
 
+# (mtime_ns of ../dirscans, directories) from the last get_available_directories scan
+_dirs_cache = None
+
 @server.tool()
 async def get_available_directories(ctx: ToolContext) -> str:
     """Lists available directories in the database."""
-    print(f"[MCP Server] Tool call: get_available_directories")
+    global _dirs_cache
+    logger.info("Tool call: get_available_directories")
     try:
+        # Adding or removing a scan changes the directory mtime, so reuse the last result until then
+        dirscans_mtime = os.stat("../dirscans").st_mtime_ns
+        if _dirs_cache is not None and _dirs_cache[0] == dirscans_mtime:
+            return list(_dirs_cache[1])
         # Find all *.sqlite3 files in the dirscans directory
-        sqlite_files = [f for f in os.listdir("../dirscans") if f.endswith(".sqlite3")]
-        # print files found to console
-        print(f"[MCP Server] Found {len(sqlite_files)} SQLite files: {sqlite_files}")
+        with os.scandir("../dirscans") as it:
+            sqlite_files = [e.name for e in it if e.name.endswith(".sqlite3") and e.is_file(follow_symlinks=False)]
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("Found %d SQLite files: %s", len(sqlite_files), sqlite_files)
         directories = []
-        # Open them to find the directory name
+        # Open them read-only to find the directory name
         for file in sqlite_files:
-            conn = sqlite3.connect(f"../dirscans/{file}")
-            cursor = conn.cursor()
-            cursor.execute("SELECT directory FROM scan_info")
-            directory = cursor.fetchone()
+            conn = sqlite3.connect(f"file:{pathname2url('../dirscans/' + file)}?mode=ro", uri=True)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT directory FROM scan_info")
+                directory = cursor.fetchone()
+            finally:
+                conn.close()
             if directory:
                 directories.append(directory[0])  # fetchone returns a tuple
-                print(f"[MCP Server] Directory: {directory[0]}")
-            conn.close()
-        return directories
+                if log_info:
+                    logger.info("Directory: %s", directory[0])
+        _dirs_cache = (dirscans_mtime, directories)
+        return list(directories)
     except Exception as e:
-        print(f"[MCP Server] Error getting available directories: {e}")
+        logger.error("Error getting available directories: %s", e)
         return f"Error getting available directories: {str(e)}"
 
 @server.tool()
 async def get_path_basename(ctx: ToolContext, path: str) -> str:
     """Returns the last part of a path name (the basename)."""
-    print(f"[MCP Server] Tool call: get_path_basename, path: {path}")
+    logger.info("Tool call: get_path_basename, path: %s", path)
     try:
         basename = os.path.basename(path)
-        print(f"[MCP Server] Basename of '{path}': '{basename}'")
+        logger.info("Basename of '%s': '%s'", path, basename)
         return basename
     except Exception as e:
-        print(f"[MCP Server] Error getting basename for path '{path}': {e}")
+        logger.error("Error getting basename for path '%s': %s", path, e)
         return f"Error getting basename: {str(e)}"
 
 @server.tool()
 async def launch_file_browser(ctx: ToolContext, path: str) -> str:
     """Launches the system file browser at the specified path. Checks if path exists first."""
-    print(f"[MCP Server] Tool call: launch_file_browser, path: {path}")
+    logger.info("Tool call: launch_file_browser, path: %s", path)
     try:
-        # Check if path exists
-        if not os.path.exists(path):
+        # Check that the path exists and is a directory with a single stat call
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             error_msg = f"Error: Path '{path}' does not exist"
-            print(f"[MCP Server] {error_msg}")
+            logger.error(error_msg)
             return error_msg
-        # check if it is a directory or a file, if file return error
-        if os.path.isfile(path):
+        if not stat.S_ISDIR(st.st_mode):
             error_msg = f"Error: Path '{path}' is a file, not a directory"
-            print(f"[MCP Server] {error_msg}")
+            logger.error(error_msg)
             return error_msg
         
         # Get the operating system
         system = platform.system()
-        print(f"[MCP Server] Detected OS: {system}")
+        logger.info("Detected OS: %s", system)
         
         if system == "Linux":
             # Launch caja file manager on Linux
             try:
-                subprocess.Popen(['caja', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.Popen(['caja', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
                 success_msg = f"Successfully launched caja file browser for path: {path}"
-                print(f"[MCP Server] {success_msg}")
+                logger.info(success_msg)
                 return success_msg
             except FileNotFoundError:
                 error_msg = "Error: caja file manager not found. Please install caja or use a different file manager."
-                print(f"[MCP Server] {error_msg}")
+                logger.error(error_msg)
                 return error_msg
         elif system == "Darwin":  # macOS
             # Launch Finder on macOS
             try:
-                subprocess.Popen(['open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.Popen(['open', path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
                 success_msg = f"Successfully launched Finder for path: {path}"
-                print(f"[MCP Server] {success_msg}")
+                logger.info(success_msg)
                 return success_msg
             except Exception as e:
                 error_msg = f"Error launching Finder: {str(e)}"
-                print(f"[MCP Server] {error_msg}")
+                logger.error(error_msg)
                 return error_msg
         else:
             error_msg = f"Error: Unsupported operating system '{system}'. Only Linux and macOS are supported."
-            print(f"[MCP Server] {error_msg}")
+            logger.error(error_msg)
             return error_msg
             
     except Exception as e:
         error_msg = f"Error launching file browser: {str(e)}"
-        print(f"[MCP Server] {error_msg}")
+        logger.error(error_msg)
         return error_msg
 
 @server.tool()
 async def launch_terminal(ctx: ToolContext, path: str) -> str:
     """Launches a terminal at the specified directory path. Checks if path exists and is a directory."""
-    print(f"[MCP Server] Tool call: launch_terminal, path: {path}")
+    logger.info("Tool call: launch_terminal, path: %s", path)
     try:
-        # Check if path exists
-        if not os.path.exists(path):
+        # Check that the path exists and is a directory with a single stat call
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             error_msg = f"Error: Path '{path}' does not exist"
-            print(f"[MCP Server] {error_msg}")
+            logger.error(error_msg)
             return error_msg
-        
-        # Check if it is a directory (not a file)
-        if not os.path.isdir(path):
+        if not stat.S_ISDIR(st.st_mode):
             error_msg = f"Error: Path '{path}' is not a directory"
-            print(f"[MCP Server] {error_msg}")
+            logger.error(error_msg)
             return error_msg
         
         # Get the operating system
         system = platform.system()
-        print(f"[MCP Server] Detected OS: {system}")
+        logger.info("Detected OS: %s", system)
         
         if system == "Linux":
             # Launch mate-terminal on Linux
             try:
                 subprocess.Popen(['mate-terminal', '--working-directory', path], 
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
                 success_msg = f"Successfully launched mate-terminal at directory: {path}"
-                print(f"[MCP Server] {success_msg}")
+                logger.info(success_msg)
                 return success_msg
             except FileNotFoundError:
                 error_msg = "Error: mate-terminal not found. Please install mate-terminal or use a different terminal."
-                print(f"[MCP Server] {error_msg}")
+                logger.error(error_msg)
                 return error_msg
         elif system == "Darwin":  # macOS
             # Launch Terminal on macOS using AppleScript
             try:
-                # Use osascript to open Terminal at the specified directory
+                # Quote the path for the shell, then escape it for the AppleScript string literal
+                quoted = shlex.quote(path).replace('\\', '\\\\').replace('"', '\\"')
                 applescript = f'''tell application "Terminal"
     activate
-    do script "cd '{path}'"
+    do script "cd {quoted}"
 end tell'''
-                subprocess.Popen(['osascript', '-e', applescript], 
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                # Run osascript off the event loop, with a timeout so a stuck interpreter doesn't leak
+                await asyncio.to_thread(subprocess.run, ['osascript', '-e', applescript],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                        check=False, timeout=5)
                 success_msg = f"Successfully launched Terminal at directory: {path}"
-                print(f"[MCP Server] {success_msg}")
+                logger.info(success_msg)
                 return success_msg
             except Exception as e:
                 error_msg = f"Error launching Terminal: {str(e)}"
-                print(f"[MCP Server] {error_msg}")
+                logger.error(error_msg)
                 return error_msg
         else:
             error_msg = f"Error: Unsupported operating system '{system}'. Only Linux and macOS are supported."
-            print(f"[MCP Server] {error_msg}")
+            logger.error(error_msg)
             return error_msg
             
     except Exception as e:
         error_msg = f"Error launching terminal: {str(e)}"
-        print(f"[MCP Server] {error_msg}")
+        logger.error(error_msg)
         return error_msg
 
 # Make main synchronous
 def main(): 
-    print("[MCP Server] Starting directory scan interfaceMCP server...")
-    print("[MCP Server] Registered tools: get_available_directories, get_db_metadata, run_sql_query, get_path_basename, launch_file_browser, launch_terminal")
+    setup_logging()
+    logger.info("Starting directory scan interfaceMCP server...")
+    logger.info("Registered tools: get_available_directories, get_db_metadata, run_sql_query, get_path_basename, launch_file_browser, launch_terminal")
     # Call server.run() directly. It's expected to be a blocking call that manages its own event loop.
     server.run(transport="sse")
 
@@ -2,22 +2,408 @@ import os
 import pwd
 import grp
 import stat
-import datetime
+import html
+import time
+import logging
 import platform
 import subprocess
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit, QScrollArea
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QPalette
+from collections import namedtuple, OrderedDict
+from functools import lru_cache
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 
 from nsNotebook import NotebookWidget
+from dirscans._statx import statx, AT_FDCWD, STATX_BASIC_STATS
+
+# Metadata is also collected in the background for entries that were never selected,
+# so per-entry messages are only logged at debug level
+logger = logging.getLogger(__name__)
+
+# ACLs are read with pylibacl, which only exists on Linux; neither changes while running
+_ACL_SUPPORT = platform.system() == 'Linux'
+try:
+    import posix1e
+except ImportError:
+    _ACL_SUPPORT = False
+    posix1e = None
+
+
+# The subset of os.stat_result fields the details view reads
+StatResult = namedtuple("StatResult", "st_mode st_ino st_dev st_nlink st_uid st_gid st_size "
+                                       "st_atime st_mtime st_ctime st_mtime_ns st_ctime_ns")
+
+
+def _stat_fast(path):
+    """os.stat replacement that asks statx not to sync attributes with a network file server.
+
+    Falls back to os.stat where statx is not available.
+    """
+    buf = statx(AT_FDCWD, path, STATX_BASIC_STATS)
+    if buf is None:
+        return os.stat(path)
+    return StatResult(
+        buf.stx_mode, buf.stx_ino, os.makedev(buf.stx_dev_major, buf.stx_dev_minor),
+        buf.stx_nlink, buf.stx_uid, buf.stx_gid, buf.stx_size,
+        buf.stx_atime.tv_sec + buf.stx_atime.tv_nsec / 1e9,
+        buf.stx_mtime.tv_sec + buf.stx_mtime.tv_nsec / 1e9,
+        buf.stx_ctime.tv_sec + buf.stx_ctime.tv_nsec / 1e9,
+        buf.stx_mtime.tv_sec * 1000000000 + buf.stx_mtime.tv_nsec,
+        buf.stx_ctime.tv_sec * 1000000000 + buf.stx_ctime.tv_nsec,
+    )
+
+
+# Name service lookups can go to LDAP/SSSD on HPC systems, so remember them
+@lru_cache(maxsize=512)
+def _user_name(uid):
+    """Returns the name of uid, or the number itself if it has no name."""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=512)
+def _grgid(gid):
+    """Returns (group name, group members) for gid, the number and no members if it has no name."""
+    try:
+        group = grp.getgrgid(gid)
+    except KeyError:
+        return str(gid), []
+    return group.gr_name, group.gr_mem
+
+
+# "read/write/execute" style description for each 3-bit permission value
+_PERM_STRS = tuple('/'.join(p for p, b in (('read', 4), ('write', 2), ('execute', 1)) if i & b) or 'None'
+                   for i in range(8))
+
+
+def _split_file_path(path):
+    """Split path into (directory, filename, stem, extension) in one pass.
+
+    Matches os.path.split/splitext, including treating leading dots as part of the stem.
+    """
+    dir_path, filename = os.path.split(path)
+    stem, dot, ext_raw = filename.rpartition('.')
+    if dot and stem.strip('.'):
+        return dir_path, filename, stem, '.' + ext_raw
+    return dir_path, filename, filename, ''
+
+
+@lru_cache(maxsize=256)
+def _file_type_html(ext):
+    """Escaped file type shown for an extension, e.g. "PDF" for ".pdf" """
+    return html.escape(ext.upper()[1:]) if ext else "File"
+
+
+# Format of the timestamps shown in the ACL tab
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=1024)
+def _format_timestamp(seconds):
+    """Format whole epoch seconds as local time; files in a directory often share timestamps"""
+    return time.strftime(_TIME_FORMAT, time.localtime(seconds))
+
+_SIZE_UNITS = ('bytes', 'KB', 'MB', 'GB', 'TB')
+
+
+def _format_size(size):
+    """Format a byte count in a human readable format"""
+    if size < 1024:
+        return f"{size} bytes"
+    # Each unit is 2**10 times the previous one, so the bit length picks it directly
+    i = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (i * 10)):.1f} {_SIZE_UNITS[i]}"
+
+
+def _scan_directory(path):
+    """Count the entries of a directory in a single os.scandir pass.
+
+    DirEntry reuses the dirent type and caches its stat, so each entry costs at most one syscall.
+    Scanning through a directory file descriptor makes those stats fstatat calls relative to it,
+    which spares the kernel from walking the full path for every entry.
+    Returns (total_items, dirs_count, files_count, file_sizes, hidden_dirs, hidden_files).
+    """
+    if os.scandir in os.supports_fd:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        try:
+            with os.scandir(fd) as it:
+                return _count_entries(it)
+        finally:
+            os.close(fd)
+    with os.scandir(path) as it:
+        return _count_entries(it)
+
+
+def _count_entries(it):
+    """Tally the entries of a scandir iterator for _scan_directory"""
+    total_items = files_count = file_sizes = hidden_files = hidden_dirs = 0
+    for entry in it:
+        total_items += 1
+        hidden = entry.name.startswith('.')
+        if entry.is_file(follow_symlinks=False):
+            files_count += 1
+            file_sizes += entry.stat(follow_symlinks=False).st_size
+            if hidden:
+                hidden_files += 1
+        elif hidden and entry.is_dir(follow_symlinks=False):
+            hidden_dirs += 1
+    return total_items, total_items - files_count, files_count, file_sizes, hidden_dirs, hidden_files
+
+
+class DirectoryScanSignals(QObject):
+    """Signals for DirectoryScanTask, since QRunnable is not a QObject"""
+    # path, directory mtime, counts tuple from _scan_directory, an error message,
+    # or None if the scan was skipped
+    finished = pyqtSignal(str, float, object)
+
+
+class DirectoryScanTask(QRunnable):
+    """Counts the contents of a directory on a QThreadPool thread
+
+    is_wanted(path) is checked when the task starts, so scans queued behind others
+    are skipped if their directory is no longer displayed by then.
+    """
+
+    def __init__(self, path, mtime, signals, is_wanted):
+        super().__init__()
+        self.path = path
+        self.mtime = mtime
+        self.signals = signals
+        self.is_wanted = is_wanted
+
+    def run(self):
+        if not self.is_wanted(self.path):
+            self.signals.finished.emit(self.path, self.mtime, None)
+            return
+        try:
+            counts = _scan_directory(self.path)
+        except PermissionError:
+            counts = "Permission denied"
+        except OSError as e:
+            counts = f"Error: {str(e)}"
+        self.signals.finished.emit(self.path, self.mtime, counts)
+
+
+def _collect_info(path, is_dir, previous=None):
+    """Gather the metadata shown for path.
+
+    Runs on a QThreadPool thread, so it makes the blocking calls (stat, name service
+    and ACL lookups) and no Qt calls. Returns a dict with the stat result and, for
+    directories, the owner and group names and the ACL state.
+
+    previous is an earlier result for the same path. Its owner and ACL data are
+    reused when the modification and change times are unchanged, since changing
+    either updates the change time.
+    """
+    stat_info = _stat_fast(path)
+    if previous is not None:
+        old = previous["stat"]
+        if old.st_mtime_ns == stat_info.st_mtime_ns and old.st_ctime_ns == stat_info.st_ctime_ns:
+            return dict(previous, stat=stat_info)
+    info = {"stat": stat_info}
+    if not is_dir:
+        return info
+    # get the name of the user and group from the UID and GID
+    info["user"] = _user_name(stat_info.st_uid)
+    info["group"], info["group_members"] = _grgid(stat_info.st_gid)
+
+    # check for ACLs on the directory, read once for both the Overview and ACL tabs
+    has_acls = False
+    acl_text = acl_error = None
+    if _ACL_SUPPORT:
+        try:
+            acl = posix1e.ACL(file=path)
+            # Check for extended ACL entries beyond the standard owner/group/other permissions
+            # Standard entries are: ACL_USER_OBJ, ACL_GROUP_OBJ, ACL_OTHER, ACL_MASK
+            # Extended ACLs have tag types: ACL_USER, ACL_GROUP
+            for entry in acl:
+                if entry.tag_type in (posix1e.ACL_USER, posix1e.ACL_GROUP):
+                    has_acls = True
+                    break
+            if has_acls:
+                logger.debug("ACLs present on directory: %s", path)
+            if acl:
+                acl_text = str(acl)
+        except Exception as e:
+            # Report errors, e.g. an unsupported file system, in the ACL tab
+            logger.debug("Error checking for ACLs on directory: %s: %s", path, e)
+            acl_error = str(e)
+    info["acl_support"] = _ACL_SUPPORT
+    info["has_acls"] = has_acls
+    info["acl_text"] = acl_text
+    info["acl_error"] = acl_error
+    return info
+
+
+class ItemInfoSignals(QObject):
+    """Signals for ItemInfoTask, since QRunnable is not a QObject"""
+    # token, path, is_dir, info dict from _collect_info, None if the path
+    # does not exist, or an error message
+    finished = pyqtSignal(int, str, bool, object)
+
+
+class ItemInfoTask(QRunnable):
+    """Collects the metadata of a selected file or directory on a QThreadPool thread"""
+
+    def __init__(self, token, path, is_dir, signals, previous=None):
+        super().__init__()
+        self.token = token
+        self.path = path
+        self.is_dir = is_dir
+        self.signals = signals
+        self.previous = previous
+
+    def run(self):
+        try:
+            info = _collect_info(self.path, self.is_dir, self.previous)
+        except FileNotFoundError:
+            info = None
+        except Exception as e:
+            info = str(e)
+        self.signals.finished.emit(self.token, self.path, self.is_dir, info)
+
+
+class InfoPrefetchSignals(QObject):
+    """Signals for InfoPrefetchTask, since QRunnable is not a QObject"""
+    # generation, path, is_dir, info dict from _collect_info
+    collected = pyqtSignal(int, str, bool, object)
+
+
+class InfoPrefetchTask(QRunnable):
+    """Collects the metadata of the first entries of a directory before they are selected
+
+    Entries are taken in the order the file display shows them, directories first.
+    is_current(generation) is checked before each entry, so the task stops once the
+    view has moved to another directory.
+    """
+
+    def __init__(self, generation, path, limit, signals, is_current):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.limit = limit
+        self.signals = signals
+        self.is_current = is_current
+
+    def run(self):
+        try:
+            with os.scandir(self.path) as it:
+                entries = [(entry.is_dir(), entry.name, entry.path) for entry in it]
+        except OSError:
+            return
+        entries.sort(key=lambda x: (not x[0], x[1].lower()))
+        for is_dir, _, entry_path in entries[:self.limit]:
+            if not self.is_current(self.generation):
+                return
+            try:
+                info = _collect_info(entry_path, is_dir)
+            except Exception:
+                # Never let an error escape run(), PyQt aborts the application then
+                continue
+            self.signals.collected.emit(self.generation, entry_path, is_dir, info)
+
+
+class ProcessLaunchTask(QRunnable):
+    """Starts a detached process on a QThreadPool thread, so fork/exec does not stall the GUI"""
+
+    def __init__(self, args, cwd=None):
+        super().__init__()
+        self.args = args
+        self.cwd = cwd
+
+    def run(self):
+        try:
+            subprocess.Popen(self.args, cwd=self.cwd, start_new_session=True, close_fds=True,
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"Error launching {self.args[0]}: {str(e)}")
+
+
+# Overview tab contents, filled with format_map from a dict of pre-escaped fields
+_GENERAL_TEMPLATE = """<table border=\"0\" cellspacing=\"0\" cellpadding=\"0\" style=\"border:none\">
+<tr><td><b>File System:</b></td><td style=\"padding-left: 10px; padding-right: 10px\">{fs_display}</td><td style=\"padding-left: 10px\"><b>Owner:</b></td><td style=\"padding-left: 10px\">{user} ({uid})</td><td style=\"padding-left: 10px\"><b>Access Permissions:</b></td><td style=\"padding-left: 10px\">{permissions}</td></tr>
+<tr><td><b>Directory:</b></td><td style=\"padding-left: 10px; padding-right: 10px\">{dir_name}</td><td style=\"padding-left: 10px\"><b>Owner Group:</b></td><td style=\"padding-left: 10px\">{group} ({gid})</td><td style=\"padding-left: 10px\"><b>User/Owner:</b></td><td style=\"padding-left: 10px\">{user_can}</td></tr>
+<tr><td><b>Path:</b></td><td style=\"padding-left: 10px; padding-right: 10px\">{path_display}</td><td style=\"padding-left: 10px\"><b>Group Members:</b></td><td style=\"padding-left: 10px\">{group_members_display}</td><td style=\"padding-left: 10px\"><b>Group:</b></td><td style=\"padding-left: 10px\">{group_can}</td></tr>
+<tr><td><b>Contents:</b></td><td style=\"padding-left: 10px; padding-right: 10px\" colspan=\"3\">{contents}</td><td style=\"padding-left: 10px\"><b>Others:</b></td><td style=\"padding-left: 10px\">{other_can}</td></tr>
+<tr><td><b>Hidden:</b></td><td style=\"padding-left: 10px; padding-right: 10px\" colspan=\"3\">{hidden}</td><td style=\"padding-left: 10px\"><b>ACLs:</b></td><td style=\"padding-left: 10px\">{acl_display}</td></tr>
+</table>"""
+_format_general = _GENERAL_TEMPLATE.format_map
+
+_FILE_GENERAL_TEMPLATE = """<b>File:</b> {filename}
+<br><b>Path:</b> {path}
+<br><b>Size:</b> {size_str}
+<br><b>Type:</b> {file_type} file"""
+_format_file_general = _FILE_GENERAL_TEMPLATE.format_map
+
+_FILE_PROPERTIES_TEMPLATE = """<b>Permissions:</b> {permissions}
+<br><b>Owner UID:</b> {uid}
+<br><b>Group GID:</b> {gid}
+<br><b>Size:</b> {size} bytes ({size_str})
+<br><b>Created:</b> {created}
+<br><b>Modified:</b> {modified}
+<br><b>Accessed:</b> {accessed}"""
+_format_file_properties = _FILE_PROPERTIES_TEMPLATE.format_map
+
+_FILE_DETAILS_TEMPLATE = """<b>Full Path:</b> {abs_path}
+<br><b>Directory:</b> {dir_path}
+<br><b>Filename:</b> {name}
+<br><b>Extension:</b> {ext}
+<br><b>Type:</b> Regular file
+<br><b>Inode:</b> {ino}
+<br><b>Device:</b> {dev}"""
+_format_file_details = _FILE_DETAILS_TEMPLATE.format_map
+
+_DIRECTORY_DETAILS_TEMPLATE = """<b>Full Path:</b> {abs_path}
+<br><b>Parent Directory:</b> {parent}
+<br><b>Type:</b> Directory
+<br><b>Inode:</b> {ino}
+<br><b>Device:</b> {dev}"""
+_format_directory_details = _DIRECTORY_DETAILS_TEMPLATE.format_map
+
+# Fixed fragments of the ACL row in the Overview tab and of the ACL tab
+_ACL_YES_HTML = '<span style="color: red; font-weight: bold;">Yes</span>'
+_ACL_NO_HTML = 'No'
+_ACL_UNSUPPORTED_HTML = 'Not Supported'
+_ACL_TAB_UNSUPPORTED = "<b>ACL:</b><br>Not supported on this platform."
+_ACL_TAB_EMPTY = "<b>ACL:</b><br>No ACL entries found."
+_ACL_TAB_ERROR = "<b>ACL:</b><br>Error reading ACL: {}"
+_ACL_TAB_ENTRIES = """<b>ACL:</b><pre style="font-family:monospace">{}</pre>"""
+
+
+# Stylesheet for the info labels, set once; updates only flip the label's "state" property
+_INFO_LABEL_STYLE = """
+    QLabel { color: #333333; background-color: transparent; }
+    QLabel[state="empty"] { color: #666666; font-style: italic; }
+"""
+
+
+def _set_label_state(label, state):
+    """Switch an info label between its "empty" and "filled" appearance"""
+    if label.property("state") != state:
+        label.setProperty("state", state)
+        # Dynamic properties are not watched by the style, so re-polish to apply the selector
+        label.style().unpolish(label)
+        label.style().polish(label)
+
+
+# Stylesheet for the Insights tab, set once on the page instead of on every label.
+# ClickableLabel comes last so it overrides the plain QLabel rule.
+_INSIGHTS_TAB_STYLE = """
+    QLabel { color: #333333; background-color: transparent; }
+    ClickableLabel { color: #0066cc; text-decoration: underline; margin: 2px 0px; }
+"""
 
 
 class ClickableLabel(QLabel):
-    """A clickable label that calls a function when clicked"""
+    """A clickable label that calls a function when clicked
+
+    Styled through the stylesheet of its parent, see _INSIGHTS_TAB_STYLE.
+    """
     def __init__(self, text, click_handler, parent=None):
         super().__init__(text, parent)
         self.click_handler = click_handler
-        self.setStyleSheet("color: #0066cc; text-decoration: underline; background-color: transparent; margin: 2px 0px;")
         self.setCursor(Qt.PointingHandCursor)
         self.setWordWrap(True)
     
@@ -30,10 +416,56 @@ class ClickableLabel(QLabel):
 class DetailsView(QWidget):
     """Details view component that shows information about the current directory or selected file/folder"""
     
+    # Number of directories whose content counts are remembered
+    SIZE_CACHE_SIZE = 256
+    # Number of files and directories whose collected metadata is remembered
+    INFO_CACHE_SIZE = 512
+    # Number of entries of a newly shown directory whose metadata is collected ahead of a click
+    PREFETCH_LIMIT = 32
+    # Milliseconds a selection must stay unchanged before it is rendered
+    SELECTION_DELAY_MS = 60
+    # Seconds during which repeated updates for the item already shown are ignored
+    REPEAT_UPDATE_INTERVAL = 1.0
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_path = ""
         self.sidebar = None  # Reference to Sidebar for live queries
+        # The browser never changes directory, so resolve relative paths against this
+        self._cwd = os.getcwd()
+        # (path, is_dir) -> info dict from _collect_info, revalidated by the task on reuse
+        self._info_cache = OrderedDict()
+        # Increased for every update, so results of superseded ItemInfoTasks are dropped
+        self._info_token = 0
+        self._info_signals = ItemInfoSignals(self)
+        self._info_signals.finished.connect(self._on_info_collected)
+        # Increased on every directory change, stopping the prefetch of the previous one
+        self._prefetch_generation = 0
+        # Directory the running or last prefetch was started for
+        self._prefetch_path = None
+        self._prefetch_signals = InfoPrefetchSignals(self)
+        self._prefetch_signals.collected.connect(self._on_info_prefetched)
+        # path -> (directory mtime, counts) for directories counted in the background
+        self._size_cache = OrderedDict()
+        self._scans_pending = set()
+        # Directory whose counts were requested last; older queued scans are skipped
+        self._scan_path = None
+        self._scan_signals = DirectoryScanSignals(self)
+        self._scan_signals.finished.connect(self._on_directory_scanned)
+        # Path and fields of the Overview table shown for a directory, kept to fill in the counts later
+        self._general_path = None
+        self._general_fields = None
+        # tab widget -> function filling it in, for tabs not yet shown since the last update
+        self._pending = {}
+        self._pending_error_title = ""
+        # (path, is_dir, monotonic time, info token) of the item whose metadata is shown
+        self._shown = None
+        # Latest (path, is_directory) from set_selected_item, rendered once selection settles
+        self._pending_sel = None
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.SELECTION_DELAY_MS)
+        self._debounce_timer.timeout.connect(self._apply_pending_selection)
         self.setup_ui()
 
     def set_sidebar(self, sidebar):
@@ -49,23 +481,27 @@ class DetailsView(QWidget):
                 border: 2px solid #7BB3FF;
             }
         """)
-        
-        # Also set a solid background color as backup
-        palette = self.palette()
-        palette.setColor(QPalette.Background, palette.color(QPalette.Background).fromRgb(184, 216, 255))
-        self.setPalette(palette)
-        self.setAutoFillBackground(True)
+        # Plain QWidget subclasses only paint a stylesheet background with this attribute
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         # Create layout
         layout = QVBoxLayout(self)
         layout.setContentsMargins(2, 10, 2, 2)  # Minimal margins
         layout.setSpacing(2)  # Minimal spacing
         
-        # Create tabs for different information views
-        self.general_tab = self.create_general_tab()
-        self.properties_tab = self.create_properties_tab()
-        self.details_tab = self.create_details_tab()
-        self.insights_tab = self.create_insights_tab()
+        # Create tabs for different information views. Only the Overview tab is
+        # shown at first; the others start as empty pages filled in by _ensure_tab.
+        self._tab_labels = {}
+        self.general_tab = self.create_general_tab(QWidget())
+        self.properties_tab = QWidget()
+        self.details_tab = QWidget()
+        self.insights_tab = QWidget()
+        self._tab_factories = {
+            self.properties_tab: self.create_properties_tab,
+            self.details_tab: self.create_details_tab,
+            self.insights_tab: self.create_insights_tab,
+        }
+        self._info_tabs = (self.general_tab, self.properties_tab, self.details_tab)
         
         tabs = [
             ("Overview", self.general_tab),
@@ -76,66 +512,52 @@ class DetailsView(QWidget):
         
         # Create notebook widget with custom tabs
         self.notebook = NotebookWidget(tabs=tabs, details_view=self)
+        self.notebook.currentChanged.connect(self._on_tab_changed)
         layout.addWidget(self.notebook)
         
         # Set minimum height
         self.setMinimumHeight(60)
         
-    def create_general_tab(self):
-        """Create the general information tab"""
-        widget = QWidget()
+    def _create_info_tab(self, widget):
+        """Lay out widget as an info tab holding a single label, and return the label"""
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(10, 10, 10, 10)
         
-        self.general_label = QLabel("No item selected")
-        self.general_label.setStyleSheet("color: #333333; font-style: italic; background-color: transparent;")
-        self.general_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.general_label.setWordWrap(True)
-        layout.addWidget(self.general_label)
+        label = QLabel("No item selected")
+        label.setProperty("state", "empty")
+        label.setStyleSheet(_INFO_LABEL_STYLE)
+        label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        label.setWordWrap(True)
+        layout.addWidget(label)
         layout.addStretch()
-        
+        self._tab_labels[widget] = label
+        return label
+    
+    def create_general_tab(self, widget):
+        """Create the general information tab in widget"""
+        self.general_label = self._create_info_tab(widget)
         return widget
     
-    def create_properties_tab(self):
-        """Create the properties tab"""
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(10, 10, 10, 10)
-        
-        self.properties_label = QLabel("No item selected")
-        self.properties_label.setStyleSheet("color: #333333; font-style: italic; background-color: transparent;")
-        self.properties_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.properties_label.setWordWrap(True)
-        layout.addWidget(self.properties_label)
-        layout.addStretch()
-        
+    def create_properties_tab(self, widget):
+        """Create the properties tab in widget"""
+        self.properties_label = self._create_info_tab(widget)
         return widget
     
-    def create_details_tab(self):
-        """Create the details tab"""
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(10, 10, 10, 10)
-        
-        self.details_label = QLabel("No item selected")
-        self.details_label.setStyleSheet("color: #333333; font-style: italic; background-color: transparent;")
-        self.details_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.details_label.setWordWrap(True)
-        layout.addWidget(self.details_label)
-        layout.addStretch()
-        
+    def create_details_tab(self, widget):
+        """Create the details tab in widget"""
+        self.details_label = self._create_info_tab(widget)
         return widget
     
-    def create_insights_tab(self):
-        """Create the insights tab"""
-        widget = QWidget()
+    def create_insights_tab(self, widget):
+        """Create the insights tab in widget"""
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(3)  # Reduce spacing between labels
+        # Added to the sheet the notebook gave the page, which holds the tab's background color
+        widget.setStyleSheet(widget.styleSheet() + _INSIGHTS_TAB_STYLE)
 
         # Title label
         title_label = QLabel("<b>Run Search Queries:</b>")
-        title_label.setStyleSheet("color: #333333; background-color: transparent;")
         layout.addWidget(title_label)
         
         # Store clickable labels for later updates
@@ -167,21 +589,64 @@ class DetailsView(QWidget):
         # Add your custom logic here - you can call other functions, 
         # emit signals, show dialogs, etc.
         # Load metadata for BR200 path.
-        subprocess.Popen(["python3", "ai_assistant.py", "--batch", f'"Load metadata for short path Quartz;{clean_query}"'], cwd="./aiAssistant")
+        # No shell is involved, so the batch commands are passed without extra quotes
+        QThreadPool.globalInstance().start(ProcessLaunchTask(
+            ["python3", "ai_assistant.py", "--batch", f"Load metadata for short path Quartz;{clean_query}"],
+            cwd="./aiAssistant"))
         return clean_query
         
     def set_current_directory(self, path):
         """Update the details view with information about the current directory"""
+        # Navigation supersedes a selection that has not been rendered yet
+        self._debounce_timer.stop()
+        self._pending_sel = None
+        if path and self._is_shown(path, True):
+            # Already rendered, e.g. selected and then entered; its entries may still need prefetching
+            if path != self._prefetch_path:
+                self._start_prefetch(path)
+            return
         self.current_path = path
-        if path and os.path.exists(path):
+        # A path that does not exist is cleared once the metadata task reports it
+        if path:
             self.update_directory_info(path)
+            self._start_prefetch(path)
         else:
+            self._stop_prefetch()
             self.clear_info()
     
+    def _start_prefetch(self, path):
+        """Collect the metadata of the first entries of path in the background"""
+        self._stop_prefetch()
+        self._prefetch_path = path
+        # Lower priority than the tasks for what is on screen
+        QThreadPool.globalInstance().start(InfoPrefetchTask(
+            self._prefetch_generation, path, self.PREFETCH_LIMIT,
+            self._prefetch_signals, self._is_prefetch_current), -1)
+    
+    def _stop_prefetch(self):
+        """Stop the running prefetch and drop its remaining results"""
+        self._prefetch_generation += 1
+        self._prefetch_path = None
+    
     def set_selected_item(self, path, is_directory=False):
-        """Update the details view with information about a selected file or folder"""
+        """Update the details view with information about a selected file or folder
+
+        Rapid selection changes, e.g. arrow key navigation, are coalesced so only
+        the last selection of a burst is rendered.
+        """
+        self._pending_sel = (path, is_directory)
+        self._debounce_timer.start()
+    
+    def _apply_pending_selection(self):
+        """Render the selection stored by set_selected_item"""
+        if self._pending_sel is None:
+            return
+        path, is_directory = self._pending_sel
+        self._pending_sel = None
+        if path and self._is_shown(path, is_directory):
+            return
         self.current_path = path
-        if path and os.path.exists(path):
+        if path:
             if is_directory:
                 self.update_directory_info(path)
             else:
@@ -189,273 +654,335 @@ class DetailsView(QWidget):
         else:
             self.clear_info()
     
+    def _is_shown(self, path, is_dir):
+        """Whether path was rendered just now and no other update is in flight"""
+        shown = self._shown
+        return (shown is not None and shown[0] == path and shown[1] == is_dir
+                and shown[3] == self._info_token
+                and time.monotonic() - shown[2] < self.REPEAT_UPDATE_INTERVAL)
+    
     def update_directory_info(self, path):
         """Update tabs with directory information"""
-        try:
-            dir_name = os.path.basename(path) or path
-            stat_info = os.stat(path)
-            
-            # Count items in directory
-            try:
-                items = os.listdir(path)
-                total_items = len(items)
-                files_count = sum(1 for item in items if os.path.isfile(os.path.join(path, item)))
-                dirs_count = total_items - files_count
-                file_sizes = sum(os.path.getsize(os.path.join(path, item)) for item in items if os.path.isfile(os.path.join(path, item)))
-                # convert file_sizes to a human readable format
-                if file_sizes < 1024:
-                    file_sizes = f"{file_sizes} bytes"
-                elif file_sizes < 1024 * 1024:
-                    file_sizes = f"{file_sizes / 1024:.1f} KB"
-                elif file_sizes < 1024 * 1024 * 1024:
-                    file_sizes = f"{file_sizes / (1024 * 1024):.1f} MB"
-                else:
-                    file_sizes = f"{file_sizes / (1024 * 1024 * 1024):.1f} GB"
-            except PermissionError:
-                total_items = files_count = dirs_count = "Permission denied"
-            # get the GID and UID of the directory
-            gid = stat_info.st_gid
-            uid = stat_info.st_uid
-            # get the name of the user and group from the GID and UID            
-            user = pwd.getpwuid(uid).pw_name
-            group = grp.getgrgid(gid).gr_name
-            group_members = grp.getgrgid(gid).gr_mem
-
-            # Live query the sidebar for the file system info
-            file_system = None
-            if self.sidebar:
-                file_system = self.sidebar.find_filesystem_for_path(path)
-            fs_display = file_system['name'] if file_system and 'name' in file_system else 'Unknown'
-
-            # Permissions and human readable permissions
-            mode = stat_info.st_mode
-            permissions = stat.filemode(mode)
-            
-            # Build user permissions string
-            user_perms = []
-            if mode & stat.S_IRUSR:
-                user_perms.append("read")
-            if mode & stat.S_IWUSR:
-                user_perms.append("write") 
-            if mode & stat.S_IXUSR:
-                user_perms.append("execute")
-            if len(user_perms) > 0:
-                user_can = f"{'/'.join(user_perms)}"
-            else:
-                user_can = "None"
-            
-            # Build group permissions string
-            group_perms = []
-            if mode & stat.S_IRGRP:
-                group_perms.append("read")
-            if mode & stat.S_IWGRP:
-                group_perms.append("write") 
-            if mode & stat.S_IXGRP:
-                group_perms.append("execute")
-            if len(group_perms) > 0:
-                group_can = f"{'/'.join(group_perms)}"
-            else:
-                group_can = "None"
-
-            # Build other permissions string
-            other_perms = []
-            if mode & stat.S_IROTH:
-                other_perms.append("read")
-            if mode & stat.S_IWOTH:
-                other_perms.append("write") 
-            if mode & stat.S_IXOTH: 
-                other_perms.append("execute")
-            if len(other_perms) > 0:
-                other_can = f"{'/'.join(other_perms)}"
-            else:
-                other_can = "None"
-            
-            # truncate path as needed, make it no longer than 50, put "..." in the middle if needed
-            if len(path) > 40:
-                path_display = path[:20] + "..." + path[-20:]
-            else:
-                path_display = path
-            
-            # turn group_members into a list of strings, make sure the final string is no longer than 40 characters
-            group_members_display = ""
-            for member in group_members:
-                group_members_display += f"{member}, "
-            # remove the last comma
-            group_members_display = group_members_display[:-2]
-            if len(group_members_display) > 40:
-                group_members_display = group_members_display[:20] + "..." + group_members_display[-20:]
-
-            # Count hidden files and folders
-            hidden_files = sum(1 for item in items if item.startswith('.') and os.path.isfile(os.path.join(path, item)))
-            hidden_dirs = sum(1 for item in items if os.path.isdir(os.path.join(path, item)) and item.startswith('.'))
-
-            # check for ACLs on the current directory
-            # if platform is Linux, set ACL support to true
-            if platform.system() == 'Linux':
-                acl_support = True
-            else:
-                acl_support = False
-            has_acls = False
-            if acl_support:
-                try:
-                    import posix1e
-                    acl = posix1e.ACL(file=path)
-                    # Check for extended ACL entries beyond the standard owner/group/other permissions
-                    # Standard entries are: ACL_USER_OBJ, ACL_GROUP_OBJ, ACL_OTHER, ACL_MASK
-                    # Extended ACLs have tag types: ACL_USER, ACL_GROUP
-                    for entry in acl:
-                        if entry.tag_type in (posix1e.ACL_USER, posix1e.ACL_GROUP):
-                            has_acls = True
-                            break
-                    if has_acls:
-                        print(f"ACLs present on directory: {path}")
-                except Exception as e:
-                    # If pylibacl library is not available or error occurs, do nothing
-                    print(f"Error checking for ACLs on directory: {path}: {str(e)}")
-                    pass
-
-
-            # Overview tab
-            if not acl_support:
-                acl_display = "Not Supported"
-            else:
-                # Format ACL display with conditional coloring
-                if has_acls is True:
-                    acl_display = '<span style="color: red; font-weight: bold;">Yes</span>'
-                elif has_acls is False:
-                    acl_display = 'No'
-            
-            general_text = f"""<table border=\"0\" cellspacing=\"0\" cellpadding=\"0\" style=\"border:none\">
-<tr><td><b>File System:</b></td><td style=\"padding-left: 10px; padding-right: 10px\">{fs_display}</td><td style=\"padding-left: 10px\"><b>Owner:</b></td><td style=\"padding-left: 10px\">{user} ({uid})</td><td style=\"padding-left: 10px\"><b>Access Permissions:</b></td><td style=\"padding-left: 10px\">{permissions}</td></tr>
-<tr><td><b>Directory:</b></td><td style=\"padding-left: 10px; padding-right: 10px\">{dir_name}</td><td style=\"padding-left: 10px\"><b>Owner Group:</b></td><td style=\"padding-left: 10px\">{group} ({gid})</td><td style=\"padding-left: 10px\"><b>User/Owner:</b></td><td style=\"padding-left: 10px\">{user_can}</td></tr>
-<tr><td><b>Path:</b></td><td style=\"padding-left: 10px; padding-right: 10px\">{path_display}</td><td style=\"padding-left: 10px\"><b>Group Members:</b></td><td style=\"padding-left: 10px\">{group_members_display}</td><td style=\"padding-left: 10px\"><b>Group:</b></td><td style=\"padding-left: 10px\">{group_can}</td></tr>
-<tr><td><b>Contents:</b></td><td style=\"padding-left: 10px; padding-right: 10px\" colspan=\"3\">{total_items} items ({dirs_count} folders, {files_count} files) {file_sizes}</td><td style=\"padding-left: 10px\"><b>Others:</b></td><td style=\"padding-left: 10px\">{other_can}</td></tr>
-<tr><td><b>Hidden:</b></td><td style=\"padding-left: 10px; padding-right: 10px\" colspan=\"3\">{hidden_files+hidden_dirs} items ({hidden_dirs} folders, {hidden_files} files)</td><td style=\"padding-left: 10px\"><b>ACLs:</b></td><td style=\"padding-left: 10px\">{acl_display}</td></tr>
-</table>"""
-            self.general_label.setText(general_text)
-            self.general_label.setStyleSheet("color: #333333; background-color: transparent;")
-            
-            # ACL tab
-            created = datetime.datetime.fromtimestamp(stat_info.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-            modified = datetime.datetime.fromtimestamp(stat_info.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-            accessed = datetime.datetime.fromtimestamp(stat_info.st_atime).strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Print the ACL info if available, otherwise show a message
-            if acl_support:
-                try:
-                    import posix1e
-                    acl = posix1e.ACL(file=path)
-                    if acl:
-                        acl_html = str(acl)
-                        properties_text = f"""<b>ACL:</b><pre style="font-family:monospace">{acl_html}</pre>"""
-                    else:
-                        properties_text = "<b>ACL:</b><br>No ACL entries found."
-                except Exception as e:
-                    properties_text = f"<b>ACL:</b><br>Error reading ACL: {str(e)}"
-            else:
-                properties_text = "<b>ACL:</b><br>Not supported on this platform."
-            self.properties_label.setText(properties_text)
-            self.properties_label.setStyleSheet("color: #333333; background-color: transparent;")
-            
-            # Extended Attributes tab
-            details_text = f"""<b>Full Path:</b> {os.path.abspath(path)}
-<br><b>Parent Directory:</b> {os.path.dirname(path)}
-<br><b>Type:</b> Directory
-<br><b>Inode:</b> {stat_info.st_ino}
-<br><b>Device:</b> {stat_info.st_dev}"""
-            self.details_label.setText(details_text)
-            self.details_label.setStyleSheet("color: #333333; background-color: transparent;")
-            
-            # Insights tab - now uses persistent clickable labels, no updates needed
-
-
-            
-        except Exception as e:
-            error_text = f"<b>Error reading directory:</b> {str(e)}"
-            self.general_label.setText(error_text)
-            self.properties_label.setText(error_text)
-            self.details_label.setText(error_text)
+        self._request_info(path, True)
     
     def update_file_info(self, path):
         """Update tabs with file information"""
-        try:
-            filename = os.path.basename(path)
-            stat_info = os.stat(path)
-            file_size = stat_info.st_size
-            
-            # Format file size
-            if file_size < 1024:
-                size_str = f"{file_size} bytes"
-            elif file_size < 1024 * 1024:
-                size_str = f"{file_size / 1024:.1f} KB"
-            elif file_size < 1024 * 1024 * 1024:
-                size_str = f"{file_size / (1024 * 1024):.1f} MB"
+        self._request_info(path, False)
+    
+    def _request_info(self, path, is_dir):
+        """Collect the metadata for path on the thread pool, reusing a cached result if still valid"""
+        self._general_path = None
+        self._info_token += 1
+        previous = self._info_cache.get((path, is_dir))
+        QThreadPool.globalInstance().start(
+            ItemInfoTask(self._info_token, path, is_dir, self._info_signals, previous))
+    
+    def _on_info_collected(self, token, path, is_dir, info):
+        """Show the metadata from an ItemInfoTask unless a newer update superseded it"""
+        if token != self._info_token:
+            return
+        if info is None:
+            self._info_cache.pop((path, is_dir), None)
+            self.clear_info()
+        elif isinstance(info, str):
+            self._render_text(f"<b>Error reading {'directory' if is_dir else 'file'}:</b> {info}")
+        else:
+            self._store_info(path, is_dir, info)
+            self._show_info(path, is_dir, info)
+    
+    def _is_prefetch_current(self, generation):
+        """Called from pool threads: whether the prefetch of generation is still wanted"""
+        return generation == self._prefetch_generation
+    
+    def _on_info_prefetched(self, generation, path, is_dir, info):
+        """Cache metadata from an InfoPrefetchTask, without replacing anything newer"""
+        if generation == self._prefetch_generation and (path, is_dir) not in self._info_cache:
+            self._store_info(path, is_dir, info)
+    
+    def _store_info(self, path, is_dir, info):
+        """Remember collected metadata, evicting the least recently stored entries"""
+        self._info_cache[(path, is_dir)] = info
+        self._info_cache.move_to_end((path, is_dir))
+        while len(self._info_cache) > self.INFO_CACHE_SIZE:
+            self._info_cache.popitem(last=False)
+    
+    def _show_info(self, path, is_dir, info):
+        """Fill the tabs from collected metadata"""
+        self._shown = (path, is_dir, time.monotonic(), self._info_token)
+        stat_info = info["stat"]
+        if is_dir:
+            builders = {
+                self.general_tab: lambda: self._build_directory_general(path, info),
+                self.properties_tab: lambda: self._build_directory_properties(info),
+                self.details_tab: lambda: self._build_directory_details(path, stat_info),
+            }
+            error_title = "Error reading directory"
+        else:
+            parts = _split_file_path(path)
+            builders = {
+                self.general_tab: lambda: self._build_file_general(path, parts, stat_info),
+                self.properties_tab: lambda: self._build_file_properties(path, stat_info),
+                self.details_tab: lambda: self._build_file_details(path, parts, stat_info),
+            }
+            error_title = "Error reading file"
+        # Only the visible tab is built now, the others when they are shown
+        self._render_tabs(builders, error_title)
+        
+        # Insights tab - now uses persistent clickable labels, no updates needed
+    
+    def _build_directory_general(self, path, info):
+        """Fill the Overview tab for a directory"""
+        stat_info = info["stat"]
+        dir_name = os.path.basename(path) or path
+        # Count items in directory in the background unless they are cached
+        counts = self._get_directory_counts(path, stat_info.st_mtime)
+        gid = stat_info.st_gid
+        uid = stat_info.st_uid
+        user = info["user"]
+        group = info["group"]
+        group_members = info["group_members"]
+
+        # Live query the sidebar for the file system info
+        file_system = None
+        if self.sidebar:
+            file_system = self.sidebar.find_filesystem_for_path(path)
+        fs_display = file_system['name'] if file_system and 'name' in file_system else 'Unknown'
+
+        # Permissions and human readable permissions
+        mode = stat_info.st_mode
+        permissions = stat.filemode(mode)
+        
+        # Human readable permissions for user/owner, group and others
+        user_can = _PERM_STRS[(mode >> 6) & 7]
+        group_can = _PERM_STRS[(mode >> 3) & 7]
+        other_can = _PERM_STRS[mode & 7]
+        
+        # truncate path as needed, make it no longer than 50, put "..." in the middle if needed
+        if len(path) > 40:
+            path_display = path[:20] + "..." + path[-20:]
+        else:
+            path_display = path
+        
+        # turn group_members into a string of the names that fit in 40 characters.
+        # HPC groups can have thousands of members, so stop at the first name that does not fit
+        # and say how many were left out.
+        shown = []
+        length = 0
+        for member in group_members:
+            length += len(member) + (2 if shown else 0)
+            if length > 40:
+                break
+            shown.append(member)
+        group_members_display = ", ".join(shown)
+        hidden_members = len(group_members) - len(shown)
+        if hidden_members:
+            if shown:
+                group_members_display += f", ... (+{hidden_members} more)"
             else:
-                size_str = f"{file_size / (1024 * 1024 * 1024):.1f} GB"
-            
-            # Get file extension
-            _, ext = os.path.splitext(filename)
-            file_type = ext.upper()[1:] if ext else "File"
-            
-            # Overview tab
-            general_text = f"""<b>File:</b> {filename}
-<br><b>Path:</b> {path}
-<br><b>Size:</b> {size_str}
-<br><b>Type:</b> {file_type} file"""
-            self.general_label.setText(general_text)
-            self.general_label.setStyleSheet("color: #333333; background-color: transparent;")
-            
-            # ACL tab
-            mode = stat_info.st_mode
-            permissions = stat.filemode(mode)
-            created = datetime.datetime.fromtimestamp(stat_info.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-            modified = datetime.datetime.fromtimestamp(stat_info.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-            accessed = datetime.datetime.fromtimestamp(stat_info.st_atime).strftime("%Y-%m-%d %H:%M:%S")
-            
-            properties_text = f"""<b>Permissions:</b> {permissions}
-<br><b>Owner UID:</b> {stat_info.st_uid}
-<br><b>Group GID:</b> {stat_info.st_gid}
-<br><b>Size:</b> {file_size} bytes ({size_str})
-<br><b>Created:</b> {created}
-<br><b>Modified:</b> {modified}
-<br><b>Accessed:</b> {accessed}"""
-            self.properties_label.setText(properties_text)
-            self.properties_label.setStyleSheet("color: #333333; background-color: transparent;")
-            
-            # Extended Attributes tab
-            details_text = f"""<b>Full Path:</b> {os.path.abspath(path)}
-<br><b>Directory:</b> {os.path.dirname(path)}
-<br><b>Filename:</b> {os.path.splitext(filename)[0]}
-<br><b>Extension:</b> {ext or 'None'}
-<br><b>Type:</b> Regular file
-<br><b>Inode:</b> {stat_info.st_ino}
-<br><b>Device:</b> {stat_info.st_dev}"""
-            self.details_label.setText(details_text)
-            self.details_label.setStyleSheet("color: #333333; background-color: transparent;")
-            
+                group_members_display = f"{hidden_members} members"
+
+        # Overview tab, extended ACLs are highlighted
+        if not info["acl_support"]:
+            acl_display = _ACL_UNSUPPORTED_HTML
+        else:
+            acl_display = _ACL_YES_HTML if info["has_acls"] else _ACL_NO_HTML
+        
+        self._general_path = path
+        self._general_fields = {
+            "fs_display": html.escape(fs_display), "user": html.escape(user), "uid": uid,
+            "permissions": permissions, "dir_name": html.escape(dir_name), "group": html.escape(group),
+            "gid": gid, "user_can": user_can, "path_display": html.escape(path_display),
+            "group_members_display": html.escape(group_members_display),
+            "group_can": group_can, "other_can": other_can, "acl_display": acl_display,
+        }
+        self._show_general_info(counts)
+        _set_label_state(self.general_label, "filled")
+    
+    def _build_directory_properties(self, info):
+        """Fill the ACL tab for a directory"""
+        # Print the ACL info if available, otherwise show a message
+        if not info["acl_support"]:
+            properties_text = _ACL_TAB_UNSUPPORTED
+        elif info["acl_error"] is not None:
+            properties_text = _ACL_TAB_ERROR.format(info["acl_error"])
+        elif info["acl_text"]:
+            properties_text = _ACL_TAB_ENTRIES.format(info["acl_text"])
+        else:
+            properties_text = _ACL_TAB_EMPTY
+        self.properties_label.setText(properties_text)
+        _set_label_state(self.properties_label, "filled")
+    
+    def _build_directory_details(self, path, stat_info):
+        """Fill the Extended Attributes tab for a directory"""
+        abs_path = self._abspath(path)
+        self.details_label.setText(_format_directory_details({
+            "abs_path": abs_path, "parent": os.path.dirname(path),
+            "ino": stat_info.st_ino, "dev": stat_info.st_dev,
+        }))
+        _set_label_state(self.details_label, "filled")
+    
+    def _abspath(self, path):
+        """os.path.abspath without its getcwd call; paths from the file display are already absolute"""
+        if os.path.isabs(path):
+            return path
+        return os.path.normpath(os.path.join(self._cwd, path))
+    
+    def _render_tabs(self, builders, error_title):
+        """Build the visible tab now and keep the builders of the other tabs until they are shown
 
-                
+        builders maps each tab widget to a function that fills in its label.
+        """
+        self._pending = dict(builders)
+        self._pending_error_title = error_title
+        current = self.notebook.currentWidget()
+        if current in self._pending:
+            # setText and the state re-polish each schedule a repaint; paint once at the end
+            self.setUpdatesEnabled(False)
+            try:
+                self._run_builder(current)
+            finally:
+                self.setUpdatesEnabled(True)
+    
+    def _render_text(self, text, state=None):
+        """Show the same text in every info tab, e.g. an error or the cleared state"""
+        def show(tab):
+            label = self._tab_labels[tab]
+            label.setText(text)
+            if state:
+                _set_label_state(label, state)
+        self._render_tabs({tab: (lambda tab=tab: show(tab)) for tab in self._info_tabs}, "Error")
+    
+    def _run_builder(self, tab):
+        """Run and forget the pending builder of tab, showing errors in its label"""
+        builder = self._pending.pop(tab)
+        try:
+            builder()
         except Exception as e:
-            error_text = f"<b>Error reading file:</b> {str(e)}"
-            self.general_label.setText(error_text)
-            self.properties_label.setText(error_text)
-            self.details_label.setText(error_text)
+            self._tab_labels[tab].setText(f"<b>{self._pending_error_title}:</b> {str(e)}")
     
-    def clear_info(self):
-        """Clear all tab information"""
-        clear_text = "No item selected"
-        style = "color: #666666; font-style: italic; background-color: transparent;"
+    def _ensure_tab(self, tab):
+        """Create the widgets of tab the first time it is shown"""
+        factory = self._tab_factories.pop(tab, None)
+        if factory is not None:
+            factory(tab)
+    
+    def _on_tab_changed(self, index):
+        """Build a tab whose contents were deferred when it becomes visible"""
+        tab = self.notebook.widget(index)
+        self._ensure_tab(tab)
+        if tab in self._pending:
+            self._run_builder(tab)
+    
+    def _get_directory_counts(self, path, mtime):
+        """Return the cached content counts for path, or start counting them and return None"""
+        cached = self._size_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            self._size_cache.move_to_end(path)
+            return cached[1]
+        self._scan_path = path
+        if (path, mtime) not in self._scans_pending:
+            self._scans_pending.add((path, mtime))
+            QThreadPool.globalInstance().start(
+                DirectoryScanTask(path, mtime, self._scan_signals, self._is_scan_wanted))
+        return None
+    
+    def _is_scan_wanted(self, path):
+        """Called from pool threads: whether path is still the directory being displayed"""
+        return path == self._scan_path
+    
+    def _on_directory_scanned(self, path, mtime, counts):
+        """Cache the counts from a DirectoryScanTask and show them if path is still displayed"""
+        self._scans_pending.discard((path, mtime))
+        if counts is None:
+            # Skipped because the view had moved on. If it has come back to path since,
+            # no other scan was started for it, so start one now.
+            if path == self._scan_path:
+                self._get_directory_counts(path, mtime)
+            return
+        self._size_cache[path] = (mtime, counts)
+        self._size_cache.move_to_end(path)
+        while len(self._size_cache) > self.SIZE_CACHE_SIZE:
+            self._size_cache.popitem(last=False)
+        if path == self.current_path and path == self._general_path:
+            self._show_general_info(counts)
+    
+    def _show_general_info(self, counts):
+        """Fill the Overview table for the current directory with its content counts"""
+        if counts is None:
+            contents = hidden = "Calculating..."
+        elif isinstance(counts, str):
+            contents = hidden = counts
+        else:
+            total_items, dirs_count, files_count, file_sizes, hidden_dirs, hidden_files = counts
+            contents = f"{total_items} items ({dirs_count} folders, {files_count} files) {_format_size(file_sizes)}"
+            hidden = f"{hidden_files+hidden_dirs} items ({hidden_dirs} folders, {hidden_files} files)"
+        fields = self._general_fields
+        fields["contents"] = contents
+        fields["hidden"] = hidden
+        self.general_label.setText(_format_general(fields))
+    
+    def _build_file_general(self, path, parts, stat_info):
+        """Fill the Overview tab for a file"""
+        _, filename, _, ext = parts
         
-        self.general_label.setText(clear_text)
-        self.general_label.setStyleSheet(style)
+        # Format file size
+        size_str = _format_size(stat_info.st_size)
         
-        self.properties_label.setText(clear_text)
-        self.properties_label.setStyleSheet(style)
+        # Overview tab
+        self.general_label.setText(_format_file_general({
+            "filename": html.escape(filename), "path": html.escape(path),
+            "size_str": size_str, "file_type": _file_type_html(ext),
+        }))
+        _set_label_state(self.general_label, "filled")
+    
+    def _build_file_properties(self, path, stat_info):
+        """Fill the ACL tab for a file"""
+        file_size = stat_info.st_size
+        size_str = _format_size(file_size)
+        mode = stat_info.st_mode
+        permissions = stat.filemode(mode)
+        created = _format_timestamp(int(stat_info.st_ctime))
+        modified = _format_timestamp(int(stat_info.st_mtime))
+        accessed = _format_timestamp(int(stat_info.st_atime))
         
-        self.details_label.setText(clear_text)
-        self.details_label.setStyleSheet(style)
+        self.properties_label.setText(_format_file_properties({
+            "permissions": permissions, "uid": stat_info.st_uid, "gid": stat_info.st_gid,
+            "size": file_size, "size_str": size_str,
+            "created": created, "modified": modified, "accessed": accessed,
+        }))
+        _set_label_state(self.properties_label, "filled")
+    
+    def _build_file_details(self, path, parts, stat_info):
+        """Fill the Extended Attributes tab for a file"""
+        dir_path, _, name, ext = parts
+        abs_path = self._abspath(path)
+        self.details_label.setText(_format_file_details({
+            "abs_path": abs_path, "dir_path": dir_path, "name": name, "ext": ext or 'None',
+            "ino": stat_info.st_ino, "dev": stat_info.st_dev,
+        }))
+        _set_label_state(self.details_label, "filled")
+    
+    def clear_info(self):
+        """Clear all tab information"""
+        self._general_path = None
+        self._shown = None
+        # Drop the result of any metadata task still running for the previous item
+        self._info_token += 1
+        self._render_text("No item selected", "empty")
     
     def clear(self):
         """Clear the details view"""
+        self._debounce_timer.stop()
+        self._pending_sel = None
+        self._stop_prefetch()
         self.current_path = ""
-        self.clear_info() 
\ No newline at end of file
+        self.clear_cache()
+        self.clear_info()
+    
+    def clear_cache(self):
+        """Forget cached metadata, directory counts and user/group names, e.g. on refresh"""
+        self._shown = None
+        self._info_cache.clear()
+        self._size_cache.clear()
+        _user_name.cache_clear()
+        _grgid.cache_clear() 
\ No newline at end of file
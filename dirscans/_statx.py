@@ -0,0 +1,93 @@
+"""
+statx(2) helper for the directory scanners
+
+Asks the kernel for only the requested fields, with AT_STATX_DONT_SYNC so network
+and parallel file systems (NFS, Lustre) answer from cached attributes instead of
+contacting the server. Callers fall back to os.stat where statx is not available
+(non-Linux, old glibc, or kernels before 4.11).
+
+Shared with the file browser's details view, which imports it as dirscans._statx.
+"""
+
+import os
+import errno
+import ctypes
+import platform
+
+# statx(2) constants from <fcntl.h> / <linux/stat.h>
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_SIZE = 0x200
+STATX_BASIC_STATS = 0x7ff
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_int64), ("tv_nsec", ctypes.c_uint32), ("_reserved", ctypes.c_int32)]
+
+
+class _Statx(ctypes.Structure):
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32), ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32), ("stx_uid", ctypes.c_uint32), ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16), ("_spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64), ("stx_size", ctypes.c_uint64), ("stx_blocks", ctypes.c_uint64),
+        ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", _StatxTimestamp), ("stx_btime", _StatxTimestamp),
+        ("stx_ctime", _StatxTimestamp), ("stx_mtime", _StatxTimestamp),
+        ("stx_rdev_major", ctypes.c_uint32), ("stx_rdev_minor", ctypes.c_uint32),
+        ("stx_dev_major", ctypes.c_uint32), ("stx_dev_minor", ctypes.c_uint32),
+        ("_spare2", ctypes.c_uint64 * 14),
+    ]
+
+
+# libc statx function once resolved, False when unavailable
+_statx_func = None
+
+
+def _get_statx():
+    global _statx_func
+    if _statx_func is None:
+        _statx_func = False
+        if platform.system() == 'Linux':
+            try:
+                func = ctypes.CDLL("libc.so.6", use_errno=True).statx
+                func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(_Statx)]
+                func.restype = ctypes.c_int
+                _statx_func = func
+            except (OSError, AttributeError):
+                pass
+    return _statx_func
+
+
+def statx(dirfd, name, mask):
+    """
+    Return the _Statx of name, relative to the directory opened as dirfd (or AT_FDCWD).
+
+    Symlinks are followed. Returns None when statx is not available, so the caller
+    can use os.stat instead. Raises OSError on failure.
+    """
+    global _statx_func
+    func = _get_statx()
+    if func:
+        buf = _Statx()
+        if func(dirfd, os.fsencode(name), AT_STATX_DONT_SYNC, mask, ctypes.byref(buf)) == 0:
+            return buf
+        err = ctypes.get_errno()
+        if err != errno.ENOSYS:
+            raise OSError(err, os.strerror(err), name)
+        # Kernel predates statx, don't try again
+        _statx_func = False
+    return None
+
+
+def statx_size(dirfd, name):
+    """
+    Return the size of the file name in the directory opened as dirfd.
+
+    Symlinks are followed, like os.path.getsize. Raises OSError on failure.
+    """
+    buf = statx(dirfd, name, STATX_SIZE)
+    if buf is not None:
+        return buf.stx_size
+    return os.stat(name, dir_fd=dirfd).st_size
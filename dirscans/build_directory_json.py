@@ -17,48 +17,149 @@ import glob
 import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-def get_directory_info(directory_path):
+from _statx import statx_size
+
+try:
+    import orjson
+    json_dumps = orjson.dumps
+except ImportError:
+    # orjson is optional, fall back to the standard library encoder
+    def json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# Directories are listed through an fd where possible, so file sizes are read with
+# statx relative to it instead of resolving each full path again
+_SCANDIR_FD = os.scandir in os.supports_fd
+
+# Directories listed concurrently; file system calls are latency bound, so more
+# threads than cores pay off, especially on network file systems
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Characters of the analyzed path replaced by "_" in the output file name
+_SANITIZE = str.maketrans({'/': '_', '\\': '_', ':': '_'})
+
+# Index of the latest scan file per directory, kept next to the scans so stale
+# scans are deleted by name instead of globbing the whole script directory
+SCAN_INDEX_NAME = ".index.json"
+
+def load_scan_index(index_path):
     """
-    Walk through directory and collect information about each path.
+    Load the index of latest scans.
     
     Args:
-        directory_path (str): Path to the directory to analyze
+        index_path (str): Path of the index file
         
     Returns:
-        dict: Dictionary with path information
+        dict: Sanitized directory name -> file name of its latest scan
+    """
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_scan_index(index_path, index):
     """
-    result = {}
+    Write the index of latest scans, replacing the old file in one step.
     
+    Args:
+        index_path (str): Path of the index file
+        index (dict): Sanitized directory name -> file name of its latest scan
+    """
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+
+def scan_one(root):
+    """
+    List a single directory.
+    
+    Args:
+        root (str): Path of the directory to list
+        
+    Returns:
+        tuple: (info dict for root, list of subdirectory paths to descend into),
+        or None if the directory can't be read
+    """
+    subdirs = []
+    file_count = 0
+    total_size = 0
     try:
-        for root, dirs, files in os.walk(directory_path):
-            # Count files in current directory
-            file_count = len(files)
-            
-            # Calculate total size of files in current directory
-            total_size = 0
-            for file in files:
-                file_path = os.path.join(root, file)
+        fd = os.open(root, os.O_RDONLY | os.O_DIRECTORY) if _SCANDIR_FD else None
+    except OSError:
+        # Skip directories that can't be opened, as os.walk does
+        return None
+    try:
+        # DirEntry keeps the file type from readdir, so each file costs one
+        # size lookup and no path joins
+        with os.scandir(root if fd is None else fd) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk, symlinks to directories are not followed
+                    if not entry.is_symlink():
+                        subdirs.append(os.path.join(root, entry.name))
+                    continue
+                
+                # Count and add up the size of files in current directory
+                file_count += 1
                 try:
-                    total_size += os.path.getsize(file_path)
-                except (OSError, IOError):
+                    if fd is None:
+                        total_size += entry.stat().st_size
+                    else:
+                        total_size += statx_size(fd, entry.name)
+                except OSError:
                     # Skip files that can't be accessed
                     continue
-            
-            # Store information for this path
-            result[root] = {
-                "file_count": file_count,
-                "total_size_bytes": total_size,
-            }
+    except OSError:
+        # Skip directories that can't be read, as os.walk does
+        return None
+    finally:
+        if fd is not None:
+            os.close(fd)
     
-    except PermissionError:
-        print(f"Error: Permission denied accessing {directory_path}")
-        sys.exit(1)
-    except FileNotFoundError:
-        print(f"Error: Directory {directory_path} not found")
-        sys.exit(1)
+    info = {
+        "file_count": file_count,
+        "total_size_bytes": total_size,
+    }
+    return info, subdirs
+
+
+def get_directory_info(directory_path, workers=DEFAULT_WORKERS):
+    """
+    Walk through directory and yield information about each path as it is scanned.
+    
+    Directories are listed in parallel by a thread pool; scandir and stat release
+    the GIL, so the threads overlap their file system latency.
     
-    return result
+    Args:
+        directory_path (str): Path to the directory to analyze
+        workers (int): Number of directories listed concurrently
+        
+    Yields:
+        tuple: (path, info dict) for each readable directory, in the order the scans finish
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(scan_one, directory_path): directory_path}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                root = running.pop(future)
+                scanned = future.result()
+                if scanned is None:
+                    continue
+                info, subdirs = scanned
+                for subdir in subdirs:
+                    running[pool.submit(scan_one, subdir)] = subdir
+                yield root, info
 
 
 def main():
@@ -70,6 +171,12 @@ def main():
         "directory",
         help="Directory path to analyze"
     )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of directories scanned in parallel (default: {DEFAULT_WORKERS})"
+    )
     
     args = parser.parse_args()
     
@@ -78,42 +185,80 @@ def main():
         print(f"Error: '{args.directory}' is not a valid directory")
         sys.exit(1)
     
-    # Get directory information
-    print(f"Analyzing directory: {args.directory}")
-    directory_info = get_directory_info(args.directory)
-    
     # Create output JSON file in the script's directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     # use the path to analyze as the name of the output file
     # prepand with YYYMMDD_HHMMSS
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = os.path.join(script_dir, timestamp + "_" + args.directory.replace('/', '_').replace('\\', '_').replace(':', '_') + ".json")
-    # Check for existing files with same directory name but different timestamp
-    existing_files = glob.glob(os.path.join(script_dir, "*_" + args.directory.replace('/', '_').replace('\\', '_').replace(':', '_') + ".json"))
-    if existing_files:
-        # delete the file
-        for file in existing_files:
-            os.remove(file)
+    sanitized = args.directory.translate(_SANITIZE)
+    output_name = timestamp + "_" + sanitized + ".json"
+    output_file = os.path.join(script_dir, output_name)
+    # The scan is written under a hidden temporary name and renamed when complete, so
+    # readers never see a partial file and the previous scan survives a failed run
+    temp_file = os.path.join(script_dir, "." + output_name + ".tmp")
+    # Leftovers of runs of the same directory that were killed before the rename
+    for file in glob.glob(os.path.join(script_dir, ".*_" + sanitized + ".json.tmp")):
+        os.remove(file)
     
-    # Add metadata to the result
-    result = {
-        "analyzed_directory": os.path.abspath(args.directory),
-        "total_paths": len(directory_info),
-        "paths": directory_info
-    }
-    
-    # Write JSON file
+    # Get directory information and write the JSON file as directories are scanned,
+    # one path per line, so the whole tree is never held in memory
+    print(f"Analyzing directory: {args.directory}")
+    total_paths = 0
+    total_files = 0
+    total_size = 0
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        try:
+            # Written as UTF-8 bytes, which is what orjson produces
+            with open(temp_file, 'wb') as f:
+                f.write(b'{\n  "analyzed_directory": ')
+                f.write(json_dumps(os.path.abspath(args.directory)))
+                f.write(b',\n  "paths": {')
+                separator = b'\n    '
+                for path, info in get_directory_info(args.directory, max(1, args.workers)):
+                    f.write(separator)
+                    f.write(json_dumps(path))
+                    f.write(b': ')
+                    f.write(json_dumps(info))
+                    separator = b',\n    '
+                    total_paths += 1
+                    total_files += info["file_count"]
+                    total_size += info["total_size_bytes"]
+                # The path count is only known at the end, after the paths
+                f.write(b'\n  },\n  "total_paths": %d\n}\n' % total_paths)
+            os.replace(temp_file, output_file)
+        except BaseException:
+            try:
+                os.remove(temp_file)
+            except FileNotFoundError:
+                pass
+            raise
         
-        print(f"JSON file created successfully: {output_file}")
-        print(f"Total paths analyzed: {len(directory_info)}")
+        # Only now that the new scan is in place, delete the previous scan of the same
+        # directory, looked up in the index of latest scans
+        index_path = os.path.join(script_dir, SCAN_INDEX_NAME)
+        index = load_scan_index(index_path)
+        previous = index.get(sanitized)
+        indexed = False
+        if previous is not None and previous != output_name:
+            try:
+                os.remove(os.path.join(script_dir, previous))
+                indexed = True
+            except FileNotFoundError:
+                pass
+        if not indexed:
+            # Not in the index yet, or the index is stale (e.g. removed by hand), so check for
+            # existing files with same directory name but different timestamp
+            for file in glob.glob(os.path.join(script_dir, "*_" + sanitized + ".json")):
+                if file != output_file:
+                    os.remove(file)
         
-        # Calculate and display summary
-        total_files = sum(info["file_count"] for info in directory_info.values())
-        total_size = sum(info["total_size_bytes"] for info in directory_info.values())
+        index[sanitized] = output_name
+        save_scan_index(index_path, index)
+        
+        print(f"JSON file created successfully: {output_file}")
+        print(f"Total paths analyzed: {total_paths}")
         
+        # Display summary
         print(f"Total files: {total_files}")
         print(f"Total size: {total_size:,} bytes ({total_size / (1024 * 1024):.2f} MB)")
         
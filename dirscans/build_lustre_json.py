@@ -13,17 +13,29 @@ import pwd
 import grp
 import subprocess
 import argparse
+import base64
 import sqlite3
 
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import posix1e
+except ImportError:
+    # pylibacl is optional, fall back to running getfacl
+    posix1e = None
+
+# Files and directories examined concurrently. The work is stat and xattr calls and lfs
+# subprocesses, which release the GIL, so threads overlap their latency.
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 
 
 def run_command(cmd, ignore_errors=True):
-    """Run a shell command and return the output."""
+    """Run a command given as an argument list, without a shell, and return the output."""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             return result.stdout.strip()
         elif not ignore_errors:
@@ -36,15 +48,43 @@ def run_command(cmd, ignore_errors=True):
 
 
 
+# User and group names by id, including ids without a name. Lookups can go to
+# LDAP/SSSD, and a tree usually has only a handful of distinct owners.
+_UID_CACHE = {}
+_GID_CACHE = {}
 
 
+def uid_to_name(uid):
+    """Return the user name for uid, or the uid as a string if it has none."""
+    name = _UID_CACHE.get(uid)
+    if name is None:
+        try:
+            name = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            name = str(uid)
+        _UID_CACHE[uid] = name
+    return name
 
 
+def gid_to_name(gid):
+    """Return the group name for gid, or the gid as a string if it has none."""
+    name = _GID_CACHE.get(gid)
+    if name is None:
+        try:
+            name = grp.getgrgid(gid).gr_name
+        except KeyError:
+            name = str(gid)
+        _GID_CACHE[gid] = name
+    return name
 
-def get_standard_metadata(filepath):
-    """Gather standard Linux file metadata."""
+
+def get_standard_metadata(filepath, entry=None):
+    """Gather standard Linux file metadata.
+
+    entry is the os.DirEntry of filepath, if available, whose cached stat is reused.
+    """
     try:
-        file_stat = os.stat(filepath)
+        file_stat = entry.stat() if entry is not None else os.stat(filepath)
         
         # Get file type
         file_mode = file_stat.st_mode
@@ -66,15 +106,8 @@ def get_standard_metadata(filepath):
             file_type = 'unknown'
         
         # Get user and group names
-        try:
-            username = pwd.getpwuid(file_stat.st_uid).pw_name
-        except KeyError:
-            username = str(file_stat.st_uid)
-        
-        try:
-            groupname = grp.getgrgid(file_stat.st_gid).gr_name
-        except KeyError:
-            groupname = str(file_stat.st_gid)
+        username = uid_to_name(file_stat.st_uid)
+        groupname = gid_to_name(file_stat.st_gid)
         
         metadata = {
             'path': filepath,
@@ -82,22 +115,7 @@ def get_standard_metadata(filepath):
             'size_bytes': file_stat.st_size,
             'size_human': format_bytes(file_stat.st_size),
             'type': file_type,
-            'permissions': {
-                'octal': oct(file_stat.st_mode)[-3:],
-                'symbolic': stat.filemode(file_stat.st_mode),
-                'user_readable': bool(file_stat.st_mode & stat.S_IRUSR),
-                'user_writable': bool(file_stat.st_mode & stat.S_IWUSR),
-                'user_executable': bool(file_stat.st_mode & stat.S_IXUSR),
-                'group_readable': bool(file_stat.st_mode & stat.S_IRGRP),
-                'group_writable': bool(file_stat.st_mode & stat.S_IWGRP),
-                'group_executable': bool(file_stat.st_mode & stat.S_IXGRP),
-                'other_readable': bool(file_stat.st_mode & stat.S_IROTH),
-                'other_writable': bool(file_stat.st_mode & stat.S_IWOTH),
-                'other_executable': bool(file_stat.st_mode & stat.S_IXOTH),
-                'setuid': bool(file_stat.st_mode & stat.S_ISUID),
-                'setgid': bool(file_stat.st_mode & stat.S_ISGID),
-                'sticky': bool(file_stat.st_mode & stat.S_ISVTX)
-            },
+            'mode': file_stat.st_mode,
             'ownership': {
                 'uid': file_stat.st_uid,
                 'gid': file_stat.st_gid,
@@ -107,10 +125,7 @@ def get_standard_metadata(filepath):
             'timestamps': {
                 'access_time': file_stat.st_atime,
                 'modify_time': file_stat.st_mtime,
-                'change_time': file_stat.st_ctime,
-                'access_time_iso': datetime.fromtimestamp(file_stat.st_atime).isoformat(),
-                'modify_time_iso': datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                'change_time_iso': datetime.fromtimestamp(file_stat.st_ctime).isoformat()
+                'change_time': file_stat.st_ctime
             },
             'inode': {
                 'number': file_stat.st_ino,
@@ -138,97 +153,149 @@ def get_standard_metadata(filepath):
         }
 
 
+# lfs df and lfs quota output per filesystem (st_dev), which is the same for every file on it
+_LUSTRE_FS_CACHE = {}
+
+
+def get_lustre_filesystem_info(filepath):
+    """Get the Lustre filesystem and quota information for the filesystem holding filepath.
+
+    The lfs commands run only for the first file seen on each filesystem.
+    """
+    try:
+        fs_key = os.stat(filepath).st_dev
+    except OSError:
+        fs_key = filepath
+    
+    fs_data = _LUSTRE_FS_CACHE.get(fs_key)
+    if fs_data is None:
+        fs_data = {}
+        
+        # Get Lustre filesystem information
+        fs_info = run_command(["lfs", "df", filepath])
+        if fs_info:
+            fs_data['filesystem_info'] = fs_info
+        
+        # Get quota information if available
+        quota_info = run_command(["lfs", "quota", "-u", str(os.getuid()), filepath])
+        if quota_info and 'not supported' not in quota_info.lower():
+            fs_data['user_quota'] = quota_info
+        
+        _LUSTRE_FS_CACHE[fs_key] = fs_data
+    return fs_data
+
+
 def get_lustre_metadata(filepath):
     """Gather Lustre-specific file metadata using lfs commands."""
     lustre_data = {}
     
-    # Get Lustre stripe information
-    stripe_info = run_command(f"lfs getstripe -v '{filepath}'")
-    if stripe_info:
-        lustre_data['stripe_info_raw'] = stripe_info
+    # Get the verbose stripe layout as YAML with a single lfs call. It includes the
+    # OST index of every object, the FID and all components of composite layouts.
+    layout_info = run_command(["lfs", "getstripe", "-v", "-y", filepath])
+    if layout_info:
+        lustre_data['stripe_info_raw'] = layout_info
         
         # Parse stripe information
-        try:
-            stripe_data = {}
-            lines = stripe_info.split('\n')
-            for line in lines:
-                line = line.strip()
-                if 'stripe_count:' in line:
-                    stripe_data['stripe_count'] = int(line.split(':')[1].strip())
-                elif 'stripe_size:' in line:
-                    stripe_data['stripe_size'] = int(line.split(':')[1].strip())
-                elif 'stripe_offset:' in line:
-                    stripe_data['stripe_offset'] = int(line.split(':')[1].strip())
-                elif 'pool:' in line and 'pool:' != line.split(':')[1].strip():
-                    stripe_data['pool'] = line.split(':')[1].strip()
+        stripe_data = {}
+        ost_indices = []
+        components = []
+        for raw_line in layout_info.split('\n'):
+            key, sep, value = raw_line.strip().partition(':')
+            value = value.strip()
+            try:
+                if key.endswith('stripe_count'):
+                    stripe_data['stripe_count'] = int(value)
+                elif key.endswith('stripe_size'):
+                    stripe_data['stripe_size'] = int(value)
+                elif key.endswith('stripe_offset'):
+                    stripe_data['stripe_offset'] = int(value)
+                elif key.endswith('pool') and value:
+                    stripe_data['pool'] = value
+                elif key.endswith('l_ost_idx'):
+                    ost_indices.append(int(value))
+                elif key == 'lmm_fid' and value:
+                    lustre_data['fid'] = value
+                elif key == 'lcm_entry_count':
+                    lustre_data['component_count'] = int(value)
+            except ValueError:
+                pass
             
-            if stripe_data:
-                lustre_data['stripe_parsed'] = stripe_data
-        except (ValueError, IndexError):
-            pass
-    
-    # Get detailed stripe layout
-    layout_info = run_command(f"lfs getstripe -y '{filepath}'")
-    if layout_info:
+            # Each component of a composite layout is a top level "componentN:" block
+            if sep and raw_line.startswith('component'):
+                components.append({
+                    'component_id': len(components),
+                    'info': [raw_line]
+                })
+            elif components and raw_line.startswith(' '):
+                components[-1]['info'].append(raw_line)
+        
+        if stripe_data:
+            lustre_data['stripe_parsed'] = stripe_data
+        if ost_indices:
+            lustre_data['ost_indices'] = ost_indices
+        if components:
+            for component in components:
+                component['info'] = '\n'.join(component['info'])
+            lustre_data['components'] = components
+        
         try:
             import yaml
             lustre_data['layout_yaml'] = yaml.safe_load(layout_info)
         except:
             lustre_data['layout_raw'] = layout_info
     
-    # Get OST (Object Storage Target) information
-    ost_info = run_command(f"lfs getstripe -O '{filepath}'")
-    if ost_info:
-        lustre_data['ost_indices'] = [int(x.strip()) for x in ost_info.split() if x.strip().isdigit()]
+    # Get file FID (File Identifier) unless the layout already listed it
+    if 'fid' not in lustre_data:
+        fid_info = run_command(["lfs", "path2fid", filepath])
+        if fid_info:
+            lustre_data['fid'] = fid_info
     
-    # Get file FID (File Identifier)
-    fid_info = run_command(f"lfs path2fid '{filepath}'")
-    if fid_info:
-        lustre_data['fid'] = fid_info
-    
-    # Get component information (for composite layouts)
-    comp_info = run_command(f"lfs getstripe --component-count '{filepath}'")
-    if comp_info and comp_info.isdigit():
-        lustre_data['component_count'] = int(comp_info)
-        
-        # Get information for each component
-        components = []
-        for i in range(int(comp_info)):
-            comp_detail = run_command(f"lfs getstripe --component-id {i} '{filepath}'")
-            if comp_detail:
-                components.append({
-                    'component_id': i,
-                    'info': comp_detail
-                })
-        if components:
-            lustre_data['components'] = components
-    
-    # Get Lustre filesystem information
-    fs_info = run_command(f"lfs df '{filepath}'")
-    if fs_info:
-        lustre_data['filesystem_info'] = fs_info
-    
-    # Get quota information if available
-    quota_info = run_command(f"lfs quota -u $(id -u) '{filepath}'")
-    if quota_info and 'not supported' not in quota_info.lower():
-        lustre_data['user_quota'] = quota_info
+    # Add the filesystem wide information
+    lustre_data.update(get_lustre_filesystem_info(filepath))
     
     return lustre_data
 
 
+def _format_xattr(name, value):
+    """Format one extended attribute the way getfattr -d prints it."""
+    if not value:
+        return name
+    text = value.rstrip(b'\0')
+    try:
+        decoded = text.decode('utf-8')
+        if decoded.isprintable():
+            return f'{name}="{decoded}"'
+    except UnicodeDecodeError:
+        pass
+    return f"{name}=0s{base64.b64encode(value).decode('ascii')}"
+
+
 def get_extended_attributes(filepath):
     """Get extended attributes if available."""
     xattr_data = {}
     
-    # Get all extended attributes
-    xattr_list = run_command(f"getfattr -d '{filepath}' 2>/dev/null")
-    if xattr_list:
-        xattr_data['all_attributes'] = xattr_list
+    try:
+        names = os.listxattr(filepath)
+    except OSError:
+        return xattr_data
+    header = f"# file: {filepath.lstrip('/')}"
+    
+    def read(name):
+        try:
+            return _format_xattr(name, os.getxattr(filepath, name))
+        except OSError:
+            return None
+    
+    # Get all extended attributes (getfattr -d lists the user namespace)
+    user_attrs = [line for line in map(read, sorted(n for n in names if n.startswith('user.'))) if line]
+    if user_attrs:
+        xattr_data['all_attributes'] = "\n".join([header] + user_attrs)
     
     # Get security attributes
-    security_attrs = run_command(f"getfattr -n security.selinux '{filepath}' 2>/dev/null")
-    if security_attrs:
-        xattr_data['selinux'] = security_attrs
+    if 'security.selinux' in names:
+        selinux = read('security.selinux')
+        if selinux:
+            xattr_data['selinux'] = f"{header}\n{selinux}"
     
     return xattr_data
 
@@ -238,7 +305,28 @@ def get_acl_info(filepath):
     acl_data = {}
     
     # Get POSIX ACLs
-    posix_acl = run_command(f"getfacl '{filepath}' 2>/dev/null")
+    if posix1e is not None:
+        try:
+            stat_info = os.stat(filepath)
+            acl = posix1e.ACL(file=filepath)
+            # Directories also carry the default ACL inherited by new entries
+            default_acl = posix1e.ACL(filedef=filepath) if stat.S_ISDIR(stat_info.st_mode) else None
+        except OSError:
+            return acl_data
+        # Same layout as getfacl: header, access ACL, then default: entries
+        lines = [f"# file: {filepath.lstrip('/')}",
+                 f"# owner: {uid_to_name(stat_info.st_uid)}",
+                 f"# group: {gid_to_name(stat_info.st_gid)}"]
+        mode = stat_info.st_mode
+        if mode & (stat.S_ISUID | stat.S_ISGID | stat.S_ISVTX):
+            lines.append("# flags: " + ("s" if mode & stat.S_ISUID else "-")
+                         + ("s" if mode & stat.S_ISGID else "-") + ("t" if mode & stat.S_ISVTX else "-"))
+        lines.extend(entry for entry in str(acl).splitlines() if entry)
+        if default_acl is not None:
+            lines.extend("default:" + entry for entry in str(default_acl).splitlines() if entry)
+        posix_acl = "\n".join(lines)
+    else:
+        posix_acl = run_command(["getfacl", filepath])
     if posix_acl and 'Operation not supported' not in posix_acl:
         acl_data['posix_acl'] = posix_acl
     
@@ -251,15 +339,8 @@ def get_directory_metadata(dirpath):
         dir_stat = os.stat(dirpath)
         
         # Get user and group names
-        try:
-            username = pwd.getpwuid(dir_stat.st_uid).pw_name
-        except KeyError:
-            username = str(dir_stat.st_uid)
-        
-        try:
-            groupname = grp.getgrgid(dir_stat.st_gid).gr_name
-        except KeyError:
-            groupname = str(dir_stat.st_gid)
+        username = uid_to_name(dir_stat.st_uid)
+        groupname = gid_to_name(dir_stat.st_gid)
         
         # Count files and calculate total size
         file_count = 0
@@ -267,16 +348,15 @@ def get_directory_metadata(dirpath):
         direct_files = []
         
         try:
-            for item in os.listdir(dirpath):
-                item_path = os.path.join(dirpath, item)
-                if os.path.isfile(item_path) or os.path.islink(item_path):
-                    file_count += 1
-                    direct_files.append(item_path)
-                    try:
-                        file_stat = os.stat(item_path)
-                        total_size += file_stat.st_size
-                    except (OSError, IOError):
-                        pass  # Skip files we can't stat
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_file() or entry.is_symlink():
+                        file_count += 1
+                        direct_files.append(entry.path)
+                        try:
+                            total_size += entry.stat().st_size
+                        except (OSError, IOError):
+                            pass  # Skip files we can't stat
         except OSError:
             pass  # Handle permission errors
         
@@ -287,22 +367,7 @@ def get_directory_metadata(dirpath):
             'total_size_bytes': total_size,
             'total_size_human': format_bytes(total_size),
             'direct_files': direct_files,
-            'permissions': {
-                'octal': oct(dir_stat.st_mode)[-3:],
-                'symbolic': stat.filemode(dir_stat.st_mode),
-                'user_readable': bool(dir_stat.st_mode & stat.S_IRUSR),
-                'user_writable': bool(dir_stat.st_mode & stat.S_IWUSR),
-                'user_executable': bool(dir_stat.st_mode & stat.S_IXUSR),
-                'group_readable': bool(dir_stat.st_mode & stat.S_IRGRP),
-                'group_writable': bool(dir_stat.st_mode & stat.S_IWGRP),
-                'group_executable': bool(dir_stat.st_mode & stat.S_IXGRP),
-                'other_readable': bool(dir_stat.st_mode & stat.S_IROTH),
-                'other_writable': bool(dir_stat.st_mode & stat.S_IWOTH),
-                'other_executable': bool(dir_stat.st_mode & stat.S_IXOTH),
-                'setuid': bool(dir_stat.st_mode & stat.S_ISUID),
-                'setgid': bool(dir_stat.st_mode & stat.S_ISGID),
-                'sticky': bool(dir_stat.st_mode & stat.S_ISVTX)
-            },
+            'mode': dir_stat.st_mode,
             'ownership': {
                 'uid': dir_stat.st_uid,
                 'gid': dir_stat.st_gid,
@@ -312,10 +377,7 @@ def get_directory_metadata(dirpath):
             'timestamps': {
                 'access_time': dir_stat.st_atime,
                 'modify_time': dir_stat.st_mtime,
-                'change_time': dir_stat.st_ctime,
-                'access_time_iso': datetime.fromtimestamp(dir_stat.st_atime).isoformat(),
-                'modify_time_iso': datetime.fromtimestamp(dir_stat.st_mtime).isoformat(),
-                'change_time_iso': datetime.fromtimestamp(dir_stat.st_ctime).isoformat()
+                'change_time': dir_stat.st_ctime
             },
             'inode': {
                 'number': dir_stat.st_ino,
@@ -376,9 +438,181 @@ def format_bytes(bytes_value):
     return f"{size:.1f} {units[unit_index]}"
 
 
+# Database columns as (name, SQL type, description). Every file and directory is stored as one
+# wide row, so the metadata groups below are shared by the files and directories tables.
+_PERMISSION_COLUMNS = [
+    ("mode", "INTEGER", "Raw st_mode (file type and permission bits), decoded by the *_permissions views"),
+]
+
+# Permission flags decoded from the mode column by the permission views, as (name, bit, description)
+_PERMISSION_BITS = [
+    ("user_readable", stat.S_IRUSR, "User read permission"),
+    ("user_writable", stat.S_IWUSR, "User write permission"),
+    ("user_executable", stat.S_IXUSR, "User execute permission"),
+    ("group_readable", stat.S_IRGRP, "Group read permission"),
+    ("group_writable", stat.S_IWGRP, "Group write permission"),
+    ("group_executable", stat.S_IXGRP, "Group execute permission"),
+    ("other_readable", stat.S_IROTH, "Other read permission"),
+    ("other_writable", stat.S_IWOTH, "Other write permission"),
+    ("other_executable", stat.S_IXOTH, "Other execute permission"),
+    ("setuid", stat.S_ISUID, "Set user ID bit"),
+    ("setgid", stat.S_ISGID, "Set group ID bit"),
+    ("sticky", stat.S_ISVTX, "Sticky bit"),
+]
+
+_OWNERSHIP_COLUMNS = [
+    ("uid", "INTEGER", "User ID"),
+    ("gid", "INTEGER", "Group ID"),
+    ("username", "TEXT", "Username"),
+    ("groupname", "TEXT", "Group name"),
+]
+
+# Only the Unix timestamps are stored. Queries format them with SQLite, for example
+# strftime('%Y-%m-%dT%H:%M:%f', modify_time, 'unixepoch', 'localtime'), which is the
+# local-time ISO text the scanner used to store, to milliseconds instead of microseconds.
+_TIMESTAMP_COLUMNS = [
+    ("access_time", "REAL", "Access time (Unix timestamp)"),
+    ("modify_time", "REAL", "Modify time (Unix timestamp)"),
+    ("change_time", "REAL", "Change time (Unix timestamp)"),
+]
+
+_INODE_COLUMNS = [
+    ("inode_number", "INTEGER", "Inode number"),
+    ("device", "INTEGER", "Device ID"),
+    ("links", "INTEGER", "Number of hard links"),
+]
+
+_XATTR_COLUMNS = [
+    ("all_attributes", "TEXT", "All extended attributes"),
+    ("selinux", "TEXT", "SELinux security context"),
+]
+
+_ACL_COLUMNS = [
+    ("posix_acl", "TEXT", "POSIX ACL information"),
+]
+
+_LUSTRE_COLUMNS = [
+    ("stripe_info_raw", "TEXT", "Raw stripe information output"),
+    ("stripe_count", "INTEGER", "Number of stripes"),
+    ("stripe_size", "INTEGER", "Stripe size in bytes"),
+    ("stripe_offset", "INTEGER", "Stripe offset"),
+    ("pool", "TEXT", "OST pool name"),
+    ("layout_raw", "TEXT", "Raw layout information"),
+    ("layout_yaml", "TEXT", "Layout information in YAML format (JSON encoded)"),
+    ("ost_indices", "TEXT", "OST indices (JSON encoded array)"),
+    ("fid", "TEXT", "Lustre File Identifier"),
+    ("component_count", "INTEGER", "Number of components"),
+    ("components", "TEXT", "Component information (JSON encoded)"),
+    ("filesystem_info", "TEXT", "Filesystem information"),
+    ("user_quota", "TEXT", "User quota information"),
+]
+
+_METADATA_COLUMNS = (_PERMISSION_COLUMNS + _OWNERSHIP_COLUMNS + _TIMESTAMP_COLUMNS + _INODE_COLUMNS
+                     + _XATTR_COLUMNS + _ACL_COLUMNS)
+
+_DIRECTORY_COLUMNS = [
+    ("id", "INTEGER", "Unique directory record identifier"),
+    ("scan_id", "INTEGER", "Reference to scan"),
+    ("path", "TEXT NOT NULL", "Full path to the directory"),
+    ("basename", "TEXT", "Directory basename"),
+    ("parent_directory_id", "INTEGER", "Reference to parent directory"),
+    ("file_count", "INTEGER", "Number of direct files in directory"),
+    ("total_size_bytes", "INTEGER", "Total size of all files in directory in bytes"),
+    ("total_size_human", "TEXT", "Human-readable total size"),
+    ("error_message", "TEXT", "Error message if metadata collection failed"),
+] + _METADATA_COLUMNS
+
+_FILE_COLUMNS = [
+    ("id", "INTEGER", "Unique file record identifier"),
+    ("scan_id", "INTEGER", "Reference to scan"),
+    ("scan_order", "INTEGER", "Order in which file was scanned"),
+    ("path", "TEXT NOT NULL", "Full path to the file"),
+    ("basename", "TEXT", "File basename"),
+    ("size_bytes", "INTEGER", "File size in bytes"),
+    ("size_human", "TEXT", "Human-readable file size"),
+    ("file_type", "TEXT", "File type (regular, directory, symlink, etc.)"),
+    ("symlink_target", "TEXT", "Target of symlink if applicable"),
+    ("error_message", "TEXT", "Error message if metadata collection failed"),
+    ("directory_id", "INTEGER", "Reference to containing directory"),
+] + _METADATA_COLUMNS
+
+_FOREIGN_KEYS = {
+    'directories': {"scan_id": "scan_info.id", "parent_directory_id": "directories.id"},
+    'files': {"scan_id": "scan_info.id", "directory_id": "directories.id"},
+}
+
+
+def _file_columns(enable_lustre):
+    return _FILE_COLUMNS + _LUSTRE_COLUMNS if enable_lustre else _FILE_COLUMNS
+
+
+def _create_table(cursor, table, columns):
+    """Create table with an integer primary key named id and its foreign keys."""
+    definitions = [f"{name} {sql_type}" + (" PRIMARY KEY" if name == "id" else "")
+                   for name, sql_type, _ in columns]
+    for column, target in _FOREIGN_KEYS[table].items():
+        target_table, target_column = target.split('.')
+        definitions.append(f"FOREIGN KEY ({column}) REFERENCES {target_table} ({target_column})")
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} (\n    " + ",\n    ".join(definitions) + "\n)")
+
+
+def _insert_sql(table, columns):
+    names = [name for name, _, _ in columns]
+    return f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+
+def _symbolic_mode_sql(column):
+    """SQL expression rendering a mode column like stat.filemode, e.g. '-rwxr-xr-x'."""
+    def flag(bit, char):
+        return f"CASE WHEN {column} & {bit} THEN '{char}' ELSE '-' END"
+
+    def execute(bit, special, set_char):
+        return (f"CASE WHEN {column} & {special} THEN CASE WHEN {column} & {bit} THEN '{set_char}' "
+                f"ELSE '{set_char.upper()}' END WHEN {column} & {bit} THEN 'x' ELSE '-' END")
+
+    file_type = (f"CASE {column} & {0o170000} "
+                 + " ".join(f"WHEN {fmt} THEN '{char}'" for fmt, char in (
+                     (stat.S_IFDIR, 'd'), (stat.S_IFLNK, 'l'), (stat.S_IFREG, '-'), (stat.S_IFBLK, 'b'),
+                     (stat.S_IFCHR, 'c'), (stat.S_IFIFO, 'p'), (stat.S_IFSOCK, 's')))
+                 + " ELSE '?' END")
+    parts = [file_type,
+             flag(stat.S_IRUSR, 'r'), flag(stat.S_IWUSR, 'w'), execute(stat.S_IXUSR, stat.S_ISUID, 's'),
+             flag(stat.S_IRGRP, 'r'), flag(stat.S_IWGRP, 'w'), execute(stat.S_IXGRP, stat.S_ISGID, 's'),
+             flag(stat.S_IROTH, 'r'), flag(stat.S_IWOTH, 'w'), execute(stat.S_IXOTH, stat.S_ISVTX, 't')]
+    return " || ".join(f"({part})" for part in parts)
+
+
+def _create_permissions_view(cursor, view, table, id_column):
+    """Create a view decoding the mode column of table into octal, symbolic and flag columns."""
+    columns = [f"id AS {id_column}",
+               "printf('%03o', mode & 511) AS octal",
+               f"{_symbolic_mode_sql('mode')} AS symbolic"]
+    columns += [f"(mode & {bit}) != 0 AS {name}" for name, bit, _ in _PERMISSION_BITS]
+    cursor.execute(f"CREATE VIEW IF NOT EXISTS {view} AS SELECT\n    " + ",\n    ".join(columns)
+                   + f"\nFROM {table} WHERE mode IS NOT NULL")
+
+
+def check_database_schema(cursor, enable_lustre=False):
+    """
+    Return an error message if the database was written with a different schema, else None.
+
+    Tables are created with IF NOT EXISTS, so appending to a database from an older
+    scanner version, or one created without Lustre columns, would otherwise fail on insert.
+    """
+    cursor.execute("PRAGMA table_info(files)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if not columns:
+        return None
+    if "mode" not in columns:
+        return "it was written by an older version of this scanner with an incompatible schema"
+    if enable_lustre and "stripe_count" not in columns:
+        return "it was created without --lustre and has no Lustre columns"
+    return None
+
+
 def create_database_schema(cursor, enable_lustre=False):
     """Create SQLite database schema for file metadata."""
-    
+
     # Scan info table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS scan_info (
@@ -394,251 +628,82 @@ def create_database_schema(cursor, enable_lustre=False):
             lustre_enabled BOOLEAN
         )
     ''')
-    
-    # Directories table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directories (
-            id INTEGER PRIMARY KEY,
-            scan_id INTEGER,
-            path TEXT NOT NULL,
-            basename TEXT,
-            parent_directory_id INTEGER,
-            file_count INTEGER,
-            total_size_bytes INTEGER,
-            total_size_human TEXT,
-            error_message TEXT,
-            FOREIGN KEY (scan_id) REFERENCES scan_info (id),
-            FOREIGN KEY (parent_directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory permissions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_permissions (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            octal TEXT,
-            symbolic TEXT,
-            user_readable BOOLEAN,
-            user_writable BOOLEAN,
-            user_executable BOOLEAN,
-            group_readable BOOLEAN,
-            group_writable BOOLEAN,
-            group_executable BOOLEAN,
-            other_readable BOOLEAN,
-            other_writable BOOLEAN,
-            other_executable BOOLEAN,
-            setuid BOOLEAN,
-            setgid BOOLEAN,
-            sticky BOOLEAN,
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory ownership table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_ownership (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            uid INTEGER,
-            gid INTEGER,
-            username TEXT,
-            groupname TEXT,
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory timestamps table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_timestamps (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            access_time REAL,
-            modify_time REAL,
-            change_time REAL,
-            access_time_iso TEXT,
-            modify_time_iso TEXT,
-            change_time_iso TEXT,
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory inodes table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_inodes (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            inode_number INTEGER,
-            device INTEGER,
-            links INTEGER,
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory extended attributes table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_extended_attributes (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            all_attributes TEXT,
-            selinux TEXT,
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory ACL info table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_acl_info (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            posix_acl TEXT,
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # Directory-file relationship table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS directory_files (
-            id INTEGER PRIMARY KEY,
-            directory_id INTEGER,
-            file_id INTEGER,
-            FOREIGN KEY (directory_id) REFERENCES directories (id),
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
-    
-    # Main files table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS files (
-            id INTEGER PRIMARY KEY,
-            scan_id INTEGER,
-            scan_order INTEGER,
-            path TEXT NOT NULL,
-            basename TEXT,
-            size_bytes INTEGER,
-            size_human TEXT,
-            file_type TEXT,
-            symlink_target TEXT,
-            error_message TEXT,
-            directory_id INTEGER,
-            FOREIGN KEY (scan_id) REFERENCES scan_info (id),
-            FOREIGN KEY (directory_id) REFERENCES directories (id)
-        )
-    ''')
-    
-    # File permissions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS file_permissions (
-            id INTEGER PRIMARY KEY,
-            file_id INTEGER,
-            octal TEXT,
-            symbolic TEXT,
-            user_readable BOOLEAN,
-            user_writable BOOLEAN,
-            user_executable BOOLEAN,
-            group_readable BOOLEAN,
-            group_writable BOOLEAN,
-            group_executable BOOLEAN,
-            other_readable BOOLEAN,
-            other_writable BOOLEAN,
-            other_executable BOOLEAN,
-            setuid BOOLEAN,
-            setgid BOOLEAN,
-            sticky BOOLEAN,
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
-    
-    # File ownership table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS file_ownership (
-            id INTEGER PRIMARY KEY,
-            file_id INTEGER,
-            uid INTEGER,
-            gid INTEGER,
-            username TEXT,
-            groupname TEXT,
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
-    
-    # File timestamps table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS file_timestamps (
-            id INTEGER PRIMARY KEY,
-            file_id INTEGER,
-            access_time REAL,
-            modify_time REAL,
-            change_time REAL,
-            access_time_iso TEXT,
-            modify_time_iso TEXT,
-            change_time_iso TEXT,
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
-    
-    # File inode table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS file_inodes (
-            id INTEGER PRIMARY KEY,
-            file_id INTEGER,
-            inode_number INTEGER,
-            device INTEGER,
-            links INTEGER,
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
-    
 
-    
-    # Lustre metadata table (only created if Lustre is enabled)
-    if enable_lustre:
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS lustre_metadata (
-                id INTEGER PRIMARY KEY,
-                file_id INTEGER,
-                stripe_info_raw TEXT,
-                stripe_count INTEGER,
-                stripe_size INTEGER,
-                stripe_offset INTEGER,
-                pool TEXT,
-                layout_raw TEXT,
-                layout_yaml TEXT,
-                ost_indices TEXT,
-                fid TEXT,
-                component_count INTEGER,
-                components TEXT,
-                filesystem_info TEXT,
-                user_quota TEXT,
-                FOREIGN KEY (file_id) REFERENCES files (id)
-            )
-        ''')
-    
-    # Extended attributes table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS extended_attributes (
-            id INTEGER PRIMARY KEY,
-            file_id INTEGER,
-            all_attributes TEXT,
-            selinux TEXT,
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
-    
-    # ACL info table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS acl_info (
-            id INTEGER PRIMARY KEY,
-            file_id INTEGER,
-            posix_acl TEXT,
-            FOREIGN KEY (file_id) REFERENCES files (id)
-        )
-    ''')
+    # Directories table, one row per directory with all of its metadata
+    _create_table(cursor, 'directories', _DIRECTORY_COLUMNS)
+
+    # Files table, one row per file with all of its metadata (and Lustre columns if enabled)
+    _create_table(cursor, 'files', _file_columns(enable_lustre))
+
+    # Permission bits are stored only as the raw mode, these views decode them
+    _create_permissions_view(cursor, 'directory_permissions', 'directories', 'directory_id')
+    _create_permissions_view(cursor, 'file_permissions', 'files', 'file_id')
+
+
+# Rows buffered before they are written with one executemany call
+INSERT_BATCH_SIZE = 10000
+
+# Connection settings for the one-shot database load
+BULK_LOAD_PRAGMAS = """
+    PRAGMA locking_mode=EXCLUSIVE;
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-262144;
+    PRAGMA mmap_size=268435456;
+"""
+
+
+def _next_id(cursor, table):
+    """Return the first unused id in table, so rows can be numbered before insertion."""
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def _values(data, columns):
+    return tuple(data.get(name) for name, _, _ in columns)
+
+
+def _metadata_values(meta, data):
+    """Values of the _METADATA_COLUMNS for one entry's standard metadata and scan data."""
+    inode = meta.get('inode', {})
+    return ((meta.get('mode'),)
+            + _values(meta.get('ownership', {}), _OWNERSHIP_COLUMNS)
+            + _values(meta.get('timestamps', {}), _TIMESTAMP_COLUMNS)
+            + (inode.get('number'), inode.get('device'), inode.get('links'))
+            + _values(data.get('extended_attributes', {}), _XATTR_COLUMNS)
+            + _values(data.get('acl_info', {}), _ACL_COLUMNS))
+
+
+def _lustre_values(lustre_meta):
+    stripe_parsed = lustre_meta.get('stripe_parsed', {})
+    return (
+        lustre_meta.get('stripe_info_raw'),
+        stripe_parsed.get('stripe_count'),
+        stripe_parsed.get('stripe_size'),
+        stripe_parsed.get('stripe_offset'),
+        stripe_parsed.get('pool'),
+        lustre_meta.get('layout_raw'),
+        json.dumps(lustre_meta.get('layout_yaml')) if lustre_meta.get('layout_yaml') else None,
+        json.dumps(lustre_meta.get('ost_indices')) if lustre_meta.get('ost_indices') else None,
+        lustre_meta.get('fid'),
+        lustre_meta.get('component_count'),
+        json.dumps(lustre_meta.get('components')) if lustre_meta.get('components') else None,
+        lustre_meta.get('filesystem_info'),
+        lustre_meta.get('user_quota')
+    )
 
 
 def insert_scan_data_to_db(cursor, results, enable_lustre=False):
-    """Insert scan results into SQLite database."""
-    
+    """
+    Insert scan results into SQLite database.
+
+    Each directory and file becomes a single row, written in batches with executemany
+    in one transaction that the caller commits.
+    """
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN")
+
     # Insert scan info
     scan_info = results['scan_info']
     cursor.execute('''
@@ -655,31 +720,31 @@ def insert_scan_data_to_db(cursor, results, enable_lustre=False):
         scan_info.get('recursive'),
         scan_info.get('lustre_enabled')
     ))
-    
+
     scan_id = cursor.lastrowid
-    
-    # Insert directory data first
+
+    # Insert directory data first. Ids are assigned here so children can refer to their parent.
+    directory_sql = _insert_sql('directories', _DIRECTORY_COLUMNS)
     directory_id_map = {}  # Map directory path to database ID
+    directory_id = _next_id(cursor, 'directories')
+    rows = []
     for dir_data in results['directories']:
         dir_meta = dir_data.get('standard_metadata', {})
-        
+
         # Skip directories without a valid path
         dir_path = dir_meta.get('path')
         if not dir_path:
             print(f"Warning: Skipping directory with no path in metadata", file=sys.stderr)
             continue
-        
+
         # Find parent directory ID
         parent_dir_id = None
         parent_path = os.path.dirname(dir_path)
         if parent_path != dir_path and parent_path in directory_id_map:
             parent_dir_id = directory_id_map[parent_path]
-        
-        # Insert main directory record
-        cursor.execute('''
-            INSERT INTO directories (scan_id, path, basename, parent_directory_id, file_count, total_size_bytes, total_size_human, error_message)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+
+        rows.append((
+            directory_id,
             scan_id,
             dir_meta.get('path'),
             dir_meta.get('basename'),
@@ -688,101 +753,28 @@ def insert_scan_data_to_db(cursor, results, enable_lustre=False):
             dir_meta.get('total_size_bytes'),
             dir_meta.get('total_size_human'),
             dir_meta.get('error')
-        ))
-        
-        directory_id = cursor.lastrowid
+        ) + _metadata_values(dir_meta, dir_data))
         directory_id_map[dir_path] = directory_id
-        
-        # Insert directory permissions
-        perms = dir_meta.get('permissions', {})
-        if perms:
-            cursor.execute('''
-                INSERT INTO directory_permissions (directory_id, octal, symbolic, user_readable, user_writable, user_executable,
-                                                 group_readable, group_writable, group_executable,
-                                                 other_readable, other_writable, other_executable,
-                                                 setuid, setgid, sticky)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                directory_id, perms.get('octal'), perms.get('symbolic'),
-                perms.get('user_readable'), perms.get('user_writable'), perms.get('user_executable'),
-                perms.get('group_readable'), perms.get('group_writable'), perms.get('group_executable'),
-                perms.get('other_readable'), perms.get('other_writable'), perms.get('other_executable'),
-                perms.get('setuid'), perms.get('setgid'), perms.get('sticky')
-            ))
-        
-        # Insert directory ownership
-        ownership = dir_meta.get('ownership', {})
-        if ownership:
-            cursor.execute('''
-                INSERT INTO directory_ownership (directory_id, uid, gid, username, groupname)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                directory_id, ownership.get('uid'), ownership.get('gid'),
-                ownership.get('username'), ownership.get('groupname')
-            ))
-        
-        # Insert directory timestamps
-        timestamps = dir_meta.get('timestamps', {})
-        if timestamps:
-            cursor.execute('''
-                INSERT INTO directory_timestamps (directory_id, access_time, modify_time, change_time,
-                                                access_time_iso, modify_time_iso, change_time_iso)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                directory_id, timestamps.get('access_time'), timestamps.get('modify_time'), timestamps.get('change_time'),
-                timestamps.get('access_time_iso'), timestamps.get('modify_time_iso'), timestamps.get('change_time_iso')
-            ))
-        
-        # Insert directory inode info
-        inode = dir_meta.get('inode', {})
-        if inode:
-            cursor.execute('''
-                INSERT INTO directory_inodes (directory_id, inode_number, device, links)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                directory_id, inode.get('number'), inode.get('device'), inode.get('links')
-            ))
-        
-        # Insert directory extended attributes
-        xattr = dir_data.get('extended_attributes', {})
-        if xattr:
-            cursor.execute('''
-                INSERT INTO directory_extended_attributes (directory_id, all_attributes, selinux)
-                VALUES (?, ?, ?)
-            ''', (
-                directory_id, xattr.get('all_attributes'), xattr.get('selinux')
-            ))
-        
-        # Insert directory ACL info
-        acl = dir_data.get('acl_info', {})
-        if acl:
-            cursor.execute('''
-                INSERT INTO directory_acl_info (directory_id, posix_acl)
-                VALUES (?, ?)
-            ''', (
-                directory_id, acl.get('posix_acl')
-            ))
-    
+        directory_id += 1
+
+        if len(rows) >= INSERT_BATCH_SIZE:
+            cursor.executemany(directory_sql, rows)
+            rows.clear()
+    cursor.executemany(directory_sql, rows)
+
     # Insert file data
+    file_sql = _insert_sql('files', _file_columns(enable_lustre)[1:])
+    rows = []
     for file_data in results['files']:
         std_meta = file_data.get('standard_metadata', {})
-        
+
         # Skip files without a valid path
         file_path = std_meta.get('path')
         if not file_path:
             print(f"Warning: Skipping file with no path in metadata", file=sys.stderr)
             continue
-        
-        # Find directory ID for this file
-        file_directory_id = None
-        file_dir_path = os.path.dirname(file_path)
-        file_directory_id = directory_id_map.get(file_dir_path)
-        
-        # Insert main file record
-        cursor.execute('''
-            INSERT INTO files (scan_id, scan_order, path, basename, size_bytes, size_human, file_type, symlink_target, error_message, directory_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+
+        row = (
             scan_id,
             file_data.get('scan_order'),
             std_meta.get('path'),
@@ -792,116 +784,43 @@ def insert_scan_data_to_db(cursor, results, enable_lustre=False):
             std_meta.get('type'),
             std_meta.get('symlink_target'),
             std_meta.get('error'),
-            file_directory_id
-        ))
-        
-        file_id = cursor.lastrowid
-        
-        # Create directory-file relationship
-        if file_directory_id:
-            cursor.execute('''
-                INSERT INTO directory_files (directory_id, file_id)
-                VALUES (?, ?)
-            ''', (file_directory_id, file_id))
-        
-        # Insert permissions
-        perms = std_meta.get('permissions', {})
-        if perms:
-            cursor.execute('''
-                INSERT INTO file_permissions (file_id, octal, symbolic, user_readable, user_writable, user_executable,
-                                            group_readable, group_writable, group_executable,
-                                            other_readable, other_writable, other_executable,
-                                            setuid, setgid, sticky)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                file_id, perms.get('octal'), perms.get('symbolic'),
-                perms.get('user_readable'), perms.get('user_writable'), perms.get('user_executable'),
-                perms.get('group_readable'), perms.get('group_writable'), perms.get('group_executable'),
-                perms.get('other_readable'), perms.get('other_writable'), perms.get('other_executable'),
-                perms.get('setuid'), perms.get('setgid'), perms.get('sticky')
-            ))
-        
-        # Insert ownership
-        ownership = std_meta.get('ownership', {})
-        if ownership:
-            cursor.execute('''
-                INSERT INTO file_ownership (file_id, uid, gid, username, groupname)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                file_id, ownership.get('uid'), ownership.get('gid'),
-                ownership.get('username'), ownership.get('groupname')
-            ))
-        
-        # Insert timestamps
-        timestamps = std_meta.get('timestamps', {})
-        if timestamps:
-            cursor.execute('''
-                INSERT INTO file_timestamps (file_id, access_time, modify_time, change_time,
-                                           access_time_iso, modify_time_iso, change_time_iso)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                file_id, timestamps.get('access_time'), timestamps.get('modify_time'), timestamps.get('change_time'),
-                timestamps.get('access_time_iso'), timestamps.get('modify_time_iso'), timestamps.get('change_time_iso')
-            ))
-        
-        # Insert inode info
-        inode = std_meta.get('inode', {})
-        if inode:
-            cursor.execute('''
-                INSERT INTO file_inodes (file_id, inode_number, device, links)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                file_id, inode.get('number'), inode.get('device'), inode.get('links')
-            ))
-        
-
-        
-        # Insert Lustre metadata (only if Lustre is enabled)
+            directory_id_map.get(os.path.dirname(file_path))
+        ) + _metadata_values(std_meta, file_data)
         if enable_lustre:
-            lustre_meta = file_data.get('lustre_metadata', {})
-            if lustre_meta:
-                stripe_parsed = lustre_meta.get('stripe_parsed', {})
-                cursor.execute('''
-                    INSERT INTO lustre_metadata (file_id, stripe_info_raw, stripe_count, stripe_size, stripe_offset, pool,
-                                               layout_raw, layout_yaml, ost_indices, fid, component_count, components,
-                                               filesystem_info, user_quota)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    file_id,
-                    lustre_meta.get('stripe_info_raw'),
-                    stripe_parsed.get('stripe_count'),
-                    stripe_parsed.get('stripe_size'),
-                    stripe_parsed.get('stripe_offset'),
-                    stripe_parsed.get('pool'),
-                    lustre_meta.get('layout_raw'),
-                    json.dumps(lustre_meta.get('layout_yaml')) if lustre_meta.get('layout_yaml') else None,
-                    json.dumps(lustre_meta.get('ost_indices')) if lustre_meta.get('ost_indices') else None,
-                    lustre_meta.get('fid'),
-                    lustre_meta.get('component_count'),
-                    json.dumps(lustre_meta.get('components')) if lustre_meta.get('components') else None,
-                    lustre_meta.get('filesystem_info'),
-                    lustre_meta.get('user_quota')
-                ))
-        
-        # Insert extended attributes
-        xattr = file_data.get('extended_attributes', {})
-        if xattr:
-            cursor.execute('''
-                INSERT INTO extended_attributes (file_id, all_attributes, selinux)
-                VALUES (?, ?, ?)
-            ''', (
-                file_id, xattr.get('all_attributes'), xattr.get('selinux')
-            ))
-        
-        # Insert ACL info
-        acl = file_data.get('acl_info', {})
-        if acl:
-            cursor.execute('''
-                INSERT INTO acl_info (file_id, posix_acl)
-                VALUES (?, ?)
-            ''', (
-                file_id, acl.get('posix_acl')
-            ))
+            row += _lustre_values(file_data.get('lustre_metadata', {}))
+        rows.append(row)
+
+        if len(rows) >= INSERT_BATCH_SIZE:
+            cursor.executemany(file_sql, rows)
+            rows.clear()
+    cursor.executemany(file_sql, rows)
+
+
+def _schema_columns(table, columns):
+    """Describe columns for the schema JSON file."""
+    described = {}
+    foreign_keys = _FOREIGN_KEYS.get(table, {})
+    for name, sql_type, description in columns:
+        column = {"type": sql_type.split()[0]}
+        if name == "id":
+            column["primary_key"] = True
+        if name in foreign_keys:
+            column["foreign_key"] = foreign_keys[name]
+        column["description"] = description
+        described[name] = column
+    return described
+
+
+def _permissions_view_columns(id_column, references):
+    """Describe the columns of a permissions view for the schema JSON file."""
+    columns = {
+        id_column: {"type": "INTEGER", "foreign_key": references},
+        "octal": {"type": "TEXT", "description": "Octal permission representation"},
+        "symbolic": {"type": "TEXT", "description": "Symbolic permission representation"},
+    }
+    for name, _, description in _PERMISSION_BITS:
+        columns[name] = {"type": "BOOLEAN", "description": description}
+    return columns
 
 
 def create_database_schema_json(schema_file, enable_lustre=False):
@@ -909,7 +828,7 @@ def create_database_schema_json(schema_file, enable_lustre=False):
     schema = {
         "database_schema": {
             "description": "SQLite database schema for Lustre file metadata scanner",
-            "version": "1.0",
+            "version": "2.0",
             "created": datetime.now().isoformat(),
             "tables": {
                 "scan_info": {
@@ -928,186 +847,23 @@ def create_database_schema_json(schema_file, enable_lustre=False):
                     }
                 },
                 "directories": {
-                    "description": "Directory information and metadata",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True, "description": "Unique directory record identifier"},
-                        "scan_id": {"type": "INTEGER", "foreign_key": "scan_info.id", "description": "Reference to scan"},
-                        "path": {"type": "TEXT", "description": "Full path to the directory"},
-                        "basename": {"type": "TEXT", "description": "Directory basename"},
-                        "parent_directory_id": {"type": "INTEGER", "foreign_key": "directories.id", "description": "Reference to parent directory"},
-                        "file_count": {"type": "INTEGER", "description": "Number of direct files in directory"},
-                        "total_size_bytes": {"type": "INTEGER", "description": "Total size of all files in directory in bytes"},
-                        "total_size_human": {"type": "TEXT", "description": "Human-readable total size"},
-                        "error_message": {"type": "TEXT", "description": "Error message if metadata collection failed"}
-                    }
-                },
-                "directory_permissions": {
-                    "description": "Directory permission information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id"},
-                        "octal": {"type": "TEXT", "description": "Octal permission representation"},
-                        "symbolic": {"type": "TEXT", "description": "Symbolic permission representation"},
-                        "user_readable": {"type": "BOOLEAN", "description": "User read permission"},
-                        "user_writable": {"type": "BOOLEAN", "description": "User write permission"},
-                        "user_executable": {"type": "BOOLEAN", "description": "User execute permission"},
-                        "group_readable": {"type": "BOOLEAN", "description": "Group read permission"},
-                        "group_writable": {"type": "BOOLEAN", "description": "Group write permission"},
-                        "group_executable": {"type": "BOOLEAN", "description": "Group execute permission"},
-                        "other_readable": {"type": "BOOLEAN", "description": "Other read permission"},
-                        "other_writable": {"type": "BOOLEAN", "description": "Other write permission"},
-                        "other_executable": {"type": "BOOLEAN", "description": "Other execute permission"},
-                        "setuid": {"type": "BOOLEAN", "description": "Set user ID bit"},
-                        "setgid": {"type": "BOOLEAN", "description": "Set group ID bit"},
-                        "sticky": {"type": "BOOLEAN", "description": "Sticky bit"}
-                    }
-                },
-                "directory_ownership": {
-                    "description": "Directory ownership information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id"},
-                        "uid": {"type": "INTEGER", "description": "User ID"},
-                        "gid": {"type": "INTEGER", "description": "Group ID"},
-                        "username": {"type": "TEXT", "description": "Username"},
-                        "groupname": {"type": "TEXT", "description": "Group name"}
-                    }
-                },
-                "directory_timestamps": {
-                    "description": "Directory timestamp information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id"},
-                        "access_time": {"type": "REAL", "description": "Access time (Unix timestamp)"},
-                        "modify_time": {"type": "REAL", "description": "Modify time (Unix timestamp)"},
-                        "change_time": {"type": "REAL", "description": "Change time (Unix timestamp)"},
-                        "access_time_iso": {"type": "TEXT", "description": "Access time (ISO format)"},
-                        "modify_time_iso": {"type": "TEXT", "description": "Modify time (ISO format)"},
-                        "change_time_iso": {"type": "TEXT", "description": "Change time (ISO format)"}
-                    }
-                },
-                "directory_inodes": {
-                    "description": "Directory inode information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id"},
-                        "inode_number": {"type": "INTEGER", "description": "Inode number"},
-                        "device": {"type": "INTEGER", "description": "Device ID"},
-                        "links": {"type": "INTEGER", "description": "Number of hard links"}
-                    }
-                },
-                "directory_extended_attributes": {
-                    "description": "Directory extended attributes",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id"},
-                        "all_attributes": {"type": "TEXT", "description": "All extended attributes"},
-                        "selinux": {"type": "TEXT", "description": "SELinux security context"}
-                    }
-                },
-                "directory_acl_info": {
-                    "description": "Directory Access Control List information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id"},
-                        "posix_acl": {"type": "TEXT", "description": "POSIX ACL information"}
-                    }
-                },
-                "directory_files": {
-                    "description": "Directory-file relationship mapping",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id", "description": "Reference to directory"},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id", "description": "Reference to file"}
-                    }
+                    "description": "Directory information and metadata (permissions, ownership, timestamps, inode, extended attributes, ACLs)",
+                    "columns": _schema_columns('directories', _DIRECTORY_COLUMNS)
                 },
                 "files": {
-                    "description": "Basic file information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True, "description": "Unique file record identifier"},
-                        "scan_id": {"type": "INTEGER", "foreign_key": "scan_info.id", "description": "Reference to scan"},
-                        "scan_order": {"type": "INTEGER", "description": "Order in which file was scanned"},
-                        "path": {"type": "TEXT", "description": "Full path to the file"},
-                        "basename": {"type": "TEXT", "description": "File basename"},
-                        "size_bytes": {"type": "INTEGER", "description": "File size in bytes"},
-                        "size_human": {"type": "TEXT", "description": "Human-readable file size"},
-                        "file_type": {"type": "TEXT", "description": "File type (regular, directory, symlink, etc.)"},
-                        "symlink_target": {"type": "TEXT", "description": "Target of symlink if applicable"},
-                        "error_message": {"type": "TEXT", "description": "Error message if metadata collection failed"},
-                        "directory_id": {"type": "INTEGER", "foreign_key": "directories.id", "description": "Reference to containing directory"}
-                    }
+                    "description": "File information and metadata (permissions, ownership, timestamps, inode, extended attributes, ACLs"
+                                   + (", Lustre layout)" if enable_lustre else ")"),
+                    "columns": _schema_columns('files', _file_columns(enable_lustre))
+                }
+            },
+            "views": {
+                "directory_permissions": {
+                    "description": "Permission bits decoded from directories.mode",
+                    "columns": _permissions_view_columns("directory_id", "directories.id")
                 },
                 "file_permissions": {
-                    "description": "File permission information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                        "octal": {"type": "TEXT", "description": "Octal permission representation"},
-                        "symbolic": {"type": "TEXT", "description": "Symbolic permission representation"},
-                        "user_readable": {"type": "BOOLEAN", "description": "User read permission"},
-                        "user_writable": {"type": "BOOLEAN", "description": "User write permission"},
-                        "user_executable": {"type": "BOOLEAN", "description": "User execute permission"},
-                        "group_readable": {"type": "BOOLEAN", "description": "Group read permission"},
-                        "group_writable": {"type": "BOOLEAN", "description": "Group write permission"},
-                        "group_executable": {"type": "BOOLEAN", "description": "Group execute permission"},
-                        "other_readable": {"type": "BOOLEAN", "description": "Other read permission"},
-                        "other_writable": {"type": "BOOLEAN", "description": "Other write permission"},
-                        "other_executable": {"type": "BOOLEAN", "description": "Other execute permission"},
-                        "setuid": {"type": "BOOLEAN", "description": "Set user ID bit"},
-                        "setgid": {"type": "BOOLEAN", "description": "Set group ID bit"},
-                        "sticky": {"type": "BOOLEAN", "description": "Sticky bit"}
-                    }
-                },
-                "file_ownership": {
-                    "description": "File ownership information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                        "uid": {"type": "INTEGER", "description": "User ID"},
-                        "gid": {"type": "INTEGER", "description": "Group ID"},
-                        "username": {"type": "TEXT", "description": "Username"},
-                        "groupname": {"type": "TEXT", "description": "Group name"}
-                    }
-                },
-                "file_timestamps": {
-                    "description": "File timestamp information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                        "access_time": {"type": "REAL", "description": "Access time (Unix timestamp)"},
-                        "modify_time": {"type": "REAL", "description": "Modify time (Unix timestamp)"},
-                        "change_time": {"type": "REAL", "description": "Change time (Unix timestamp)"},
-                        "access_time_iso": {"type": "TEXT", "description": "Access time (ISO format)"},
-                        "modify_time_iso": {"type": "TEXT", "description": "Modify time (ISO format)"},
-                        "change_time_iso": {"type": "TEXT", "description": "Change time (ISO format)"}
-                    }
-                },
-                "file_inodes": {
-                    "description": "File inode information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                        "inode_number": {"type": "INTEGER", "description": "Inode number"},
-                        "device": {"type": "INTEGER", "description": "Device ID"},
-                        "links": {"type": "INTEGER", "description": "Number of hard links"}
-                    }
-                },
-                "extended_attributes": {
-                    "description": "Extended file attributes",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                        "all_attributes": {"type": "TEXT", "description": "All extended attributes"},
-                        "selinux": {"type": "TEXT", "description": "SELinux security context"}
-                    }
-                },
-                "acl_info": {
-                    "description": "Access Control List information",
-                    "columns": {
-                        "id": {"type": "INTEGER", "primary_key": True},
-                        "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                        "posix_acl": {"type": "TEXT", "description": "POSIX ACL information"}
-                    }
+                    "description": "Permission bits decoded from files.mode",
+                    "columns": _permissions_view_columns("file_id", "files.id")
                 }
             },
             "usage_examples": {
@@ -1115,50 +871,112 @@ def create_database_schema_json(schema_file, enable_lustre=False):
                 "get_all_directories_from_scan": "SELECT * FROM directories WHERE scan_id = 1;",
                 "get_large_files": "SELECT path, size_bytes, size_human FROM files WHERE size_bytes > 1000000 ORDER BY size_bytes DESC;",
                 "get_executable_files": "SELECT f.path FROM files f JOIN file_permissions p ON f.id = p.file_id WHERE p.user_executable = 1;",
-                "get_recent_files": "SELECT f.path, t.modify_time_iso FROM files f JOIN file_timestamps t ON f.id = t.file_id ORDER BY t.modify_time DESC LIMIT 10;",
+                "get_files_by_octal_mode": "SELECT path FROM files WHERE (mode & 511) = 493;  -- 493 is 0o755",
+                "get_recent_files": "SELECT path, strftime('%Y-%m-%dT%H:%M:%f', modify_time, 'unixepoch', 'localtime') AS modify_time_iso FROM files ORDER BY modify_time DESC LIMIT 10;",
+                "get_files_modified_last_week": "SELECT path FROM files WHERE modify_time >= CAST(strftime('%s', 'now', '-7 days') AS REAL);",
                 "get_directory_sizes": "SELECT path, file_count, total_size_bytes, total_size_human FROM directories ORDER BY total_size_bytes DESC;",
                 "get_files_in_directory": "SELECT f.path, f.size_human FROM files f JOIN directories d ON f.directory_id = d.id WHERE d.path = '/specific/directory/path';",
                 "get_directory_tree": "SELECT d1.path as parent, d2.path as child FROM directories d1 LEFT JOIN directories d2 ON d1.id = d2.parent_directory_id ORDER BY d1.path;",
-                "get_largest_directories": "SELECT d.path, d.file_count, d.total_size_human FROM directories d ORDER BY d.total_size_bytes DESC LIMIT 10;",
+                "get_largest_directories": "SELECT path, file_count, total_size_human FROM directories ORDER BY total_size_bytes DESC LIMIT 10;",
                 "get_directory_with_most_files": "SELECT path, file_count, total_size_human FROM directories ORDER BY file_count DESC LIMIT 10;",
-                "get_directory_permissions": "SELECT d.path, dp.symbolic, do.username, do.groupname FROM directories d JOIN directory_permissions dp ON d.id = dp.directory_id JOIN directory_ownership do ON d.id = do.directory_id;",
-                "get_writable_directories": "SELECT d.path FROM directories d JOIN directory_permissions dp ON d.id = dp.directory_id WHERE dp.user_writable = 1 OR dp.group_writable = 1 OR dp.other_writable = 1;",
+                "get_directory_permissions": "SELECT d.path, dp.symbolic, d.username, d.groupname FROM directories d JOIN directory_permissions dp ON d.id = dp.directory_id;",
+                "get_writable_directories": "SELECT path FROM directories WHERE mode & 146 != 0;  -- 146 is 0o222, any write bit",
                 "get_files_and_directories": "SELECT f.path, f.size_human, d.path as directory FROM files f JOIN directories d ON f.directory_id = d.id ORDER BY d.path, f.path;"
             }
         }
     }
-    
-    # Add Lustre-specific table and examples only if Lustre is enabled
+
+    # Add Lustre-specific examples only if Lustre is enabled
     if enable_lustre:
-        schema["database_schema"]["tables"]["lustre_metadata"] = {
-            "description": "Lustre-specific file metadata",
-            "columns": {
-                "id": {"type": "INTEGER", "primary_key": True},
-                "file_id": {"type": "INTEGER", "foreign_key": "files.id"},
-                "stripe_info_raw": {"type": "TEXT", "description": "Raw stripe information output"},
-                "stripe_count": {"type": "INTEGER", "description": "Number of stripes"},
-                "stripe_size": {"type": "INTEGER", "description": "Stripe size in bytes"},
-                "stripe_offset": {"type": "INTEGER", "description": "Stripe offset"},
-                "pool": {"type": "TEXT", "description": "OST pool name"},
-                "layout_raw": {"type": "TEXT", "description": "Raw layout information"},
-                "layout_yaml": {"type": "TEXT", "description": "Layout information in YAML format (JSON encoded)"},
-                "ost_indices": {"type": "TEXT", "description": "OST indices (JSON encoded array)"},
-                "fid": {"type": "TEXT", "description": "Lustre File Identifier"},
-                "component_count": {"type": "INTEGER", "description": "Number of components"},
-                "components": {"type": "TEXT", "description": "Component information (JSON encoded)"},
-                "filesystem_info": {"type": "TEXT", "description": "Filesystem information"},
-                "user_quota": {"type": "TEXT", "description": "User quota information"}
-            }
-        }
-        # Add Lustre-specific usage examples
-        schema["database_schema"]["usage_examples"]["get_files_with_lustre_info"] = "SELECT f.path, l.stripe_count, l.stripe_size FROM files f JOIN lustre_metadata l ON f.id = l.file_id;"
-        schema["database_schema"]["usage_examples"]["get_lustre_files_by_directory"] = "SELECT d.path as directory, f.path as file, l.stripe_count FROM directories d JOIN files f ON d.id = f.directory_id JOIN lustre_metadata l ON f.id = l.file_id ORDER BY d.path;"
-    
+        schema["database_schema"]["usage_examples"]["get_files_with_lustre_info"] = "SELECT path, stripe_count, stripe_size FROM files WHERE stripe_count IS NOT NULL;"
+        schema["database_schema"]["usage_examples"]["get_lustre_files_by_directory"] = "SELECT d.path as directory, f.path as file, f.stripe_count FROM directories d JOIN files f ON d.id = f.directory_id ORDER BY d.path;"
+
     with open(schema_file, 'w') as f:
         json.dump(schema, f, indent=2)
 
 
-def scan_directory(directory_path, recursive=False, enable_lustre=False, max_depth=None):
+def _entry_name(entry):
+    return entry.name
+
+
+def walk_file_entries(directory_path, max_depth=None):
+    """
+    Collect the files below directory_path in the order os.walk(followlinks=True) visits them.
+
+    Files are regular files and symlinks, including symlinks to directories, sorted by name
+    within each directory. os.DirEntry keeps the file type from readdir, so sorting them
+    into files and directories costs no stat calls except for symlinks.
+    """
+    root_path = os.path.abspath(directory_path)
+    entries = []
+    stack = [directory_path]
+    while stack:
+        root = stack.pop()
+        # Calculate current depth relative to the starting directory
+        if max_depth is not None:
+            current_depth = root.replace(root_path, '').count(os.sep)
+            if current_depth >= max_depth:
+                continue
+        
+        try:
+            with os.scandir(root) as it:
+                scanned = list(it)
+        except OSError:
+            continue  # Handle permission errors
+        
+        dirs = []
+        files = []
+        for entry in scanned:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+        
+        # Sort directories and files for consistent order across runs
+        dirs.sort(key=_entry_name)
+        files.sort(key=_entry_name)
+        for entry in files:
+            if entry.is_file() or entry.is_symlink():
+                entries.append(entry)
+        # Also include symlinks that point to directories
+        for entry in dirs:
+            if entry.is_symlink():
+                entries.append(entry)
+        # Descend into the subdirectories, symlinked ones too, first name first
+        stack.extend(entry.path for entry in reversed(dirs))
+    
+    return entries
+
+
+def scan_directory_entry(dir_path):
+    """Gather the metadata of one directory for the scan results."""
+    return {
+        'standard_metadata': get_directory_metadata(dir_path),
+        'extended_attributes': get_extended_attributes(dir_path),
+        'acl_info': get_acl_info(dir_path)
+    }
+
+
+def scan_file_entry(entry, scan_order, enable_lustre=False):
+    """Gather the metadata of one file, given as an os.DirEntry, for the scan results."""
+    filepath = entry.path
+    file_metadata = {
+        'scan_order': scan_order,
+        'standard_metadata': get_standard_metadata(filepath, entry),
+        'extended_attributes': get_extended_attributes(filepath),
+        'acl_info': get_acl_info(filepath)
+    }
+    
+    # Only gather Lustre metadata if enabled
+    if enable_lustre:
+        file_metadata['lustre_metadata'] = get_lustre_metadata(filepath)
+    
+    return file_metadata
+
+
+def scan_directory(directory_path, recursive=False, enable_lustre=False, max_depth=None,
+                   workers=DEFAULT_WORKERS):
     """Scan directory and gather metadata for all files."""
     if not os.path.isdir(directory_path):
         print(f"Error: '{directory_path}' is not a directory", file=sys.stderr)
@@ -1168,12 +986,12 @@ def scan_directory(directory_path, recursive=False, enable_lustre=False, max_dep
     scan_info = {
         'directory': os.path.abspath(directory_path),
         'scan_time': datetime.now().isoformat(),
-        'hostname': run_command('hostname'),
+        'hostname': run_command(['hostname']),
         'recursive': recursive,
         'lustre_enabled': enable_lustre,
     }
     if enable_lustre:
-        scan_info['lustre_version'] = run_command('lfs --version')
+        scan_info['lustre_version'] = run_command(['lfs', '--version'])
     
     results = {
         'scan_info': scan_info,
@@ -1183,78 +1001,38 @@ def scan_directory(directory_path, recursive=False, enable_lustre=False, max_dep
     
     try:
         # Get list of files in directory (and subdirectories if recursive)
-        entries = []
         if recursive:
             depth_msg = f" (max depth: {max_depth})" if max_depth is not None else ""
             print(f"Recursively scanning {directory_path}{depth_msg}...", file=sys.stderr)
-            root_path = os.path.abspath(directory_path)
-            for root, dirs, files in os.walk(directory_path, followlinks=True):
-                # Calculate current depth relative to the starting directory
-                if max_depth is not None:
-                    current_depth = root.replace(root_path, '').count(os.sep)
-                    if current_depth >= max_depth:
-                        # Clear dirs to prevent os.walk from going deeper
-                        dirs[:] = []
-                        continue
-                
-                # Sort directories and files for consistent order across runs
-                dirs.sort()
-                files.sort()
-                for filename in files:
-                    item_path = os.path.join(root, filename)
-                    if os.path.isfile(item_path) or os.path.islink(item_path):
-                        entries.append(item_path)
-                # Also include symlinks that point to directories
-                for dirname in dirs:
-                    dir_path = os.path.join(root, dirname)
-                    if os.path.islink(dir_path):
-                        entries.append(dir_path)
+            entries = walk_file_entries(directory_path, max_depth)
         else:
             # Get list of files in directory only (not subdirectories)
-            items = sorted(os.listdir(directory_path))  # Sort for consistent order
-            for item in items:
-                item_path = os.path.join(directory_path, item)
-                if os.path.isfile(item_path) or os.path.islink(item_path):
-                    entries.append(item_path)
+            with os.scandir(directory_path) as it:
+                items = sorted(it, key=_entry_name)  # Sort for consistent order
+            entries = [entry for entry in items if entry.is_file() or entry.is_symlink()]
         
         # Collect directory information
         print(f"Collecting directory information...", file=sys.stderr)
         directories = collect_directory_tree(directory_path, recursive, max_depth)
         
-        for dir_path in directories:
-            print(f"Processing directory: {dir_path}", file=sys.stderr)
-            dir_metadata = get_directory_metadata(dir_path)
-            
-            # Add directory metadata
-            directory_data = {
-                'standard_metadata': dir_metadata,
-                'extended_attributes': get_extended_attributes(dir_path),
-                'acl_info': get_acl_info(dir_path)
-            }
-            
-            results['directories'].append(directory_data)
-        
-        total_files = len(entries)
-        scan_scope = "recursively" if recursive else ""
-        print(f"Found {len(entries)} files to scan {scan_scope} in {directory_path}", file=sys.stderr)
-        
-        for i, filepath in enumerate(entries, 1):
-            # Print progress every 100 files or at the end
-            if i % 100 == 0 or i == len(entries):
-                print(f"Scanning {i}/{total_files}: {filepath}", file=sys.stderr)
+        # Entries are gathered in parallel; map() still returns them in scan order
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for dir_path, directory_data in zip(directories, pool.map(scan_directory_entry, directories)):
+                print(f"Processing directory: {dir_path}", file=sys.stderr)
+                results['directories'].append(directory_data)
             
-            file_metadata = {
-                'scan_order': i,
-                'standard_metadata': get_standard_metadata(filepath),
-                'extended_attributes': get_extended_attributes(filepath),
-                'acl_info': get_acl_info(filepath)
-            }
+            total_files = len(entries)
+            scan_scope = "recursively" if recursive else ""
+            print(f"Found {len(entries)} files to scan {scan_scope} in {directory_path}", file=sys.stderr)
             
-            # Only gather Lustre metadata if enabled
-            if enable_lustre:
-                file_metadata['lustre_metadata'] = get_lustre_metadata(filepath)
-            
-            results['files'].append(file_metadata)
+            file_results = pool.map(scan_file_entry, entries, range(1, total_files + 1),
+                                    [enable_lustre] * total_files)
+            for i, (entry, file_metadata) in enumerate(zip(entries, file_results), 1):
+                # Print progress every 100 files or at the end
+                if i % 100 == 0 or i == len(entries):
+                    print(f"Scanning {i}/{total_files}: {entry.path}", file=sys.stderr)
+                
+                results['files'].append(file_metadata)
         
         # Update final scan info
         results['scan_info']['total_files'] = total_files
@@ -1300,6 +1078,8 @@ Examples:
                        help='Maximum depth for recursive scanning (default: unlimited, e.g., --max-depth 4)')
     parser.add_argument('--lustre', action='store_true',
                        help='Enable Lustre-specific metadata collection (requires lfs tools)')
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Number of files scanned in parallel (default: {DEFAULT_WORKERS})')
     
     args = parser.parse_args()
     
@@ -1316,7 +1096,8 @@ Examples:
     
     # Scan directory
     try:
-        results = scan_directory(args.directory, args.recursive, args.lustre, args.max_depth)
+        results = scan_directory(args.directory, args.recursive, args.lustre, args.max_depth,
+                                 max(1, args.workers))
         if results is None:
             sys.exit(1)
     except KeyboardInterrupt:
@@ -1345,6 +1126,15 @@ Examples:
     if args.db:
         try:
             conn = sqlite3.connect(args.db)
+            schema_error = check_database_schema(conn.cursor(), args.lustre)
+            if schema_error:
+                conn.close()
+                print(f"Error: cannot add to database {args.db}: {schema_error}. "
+                      f"Write to a new database file instead.", file=sys.stderr)
+                sys.exit(1)
+            # Bulk load settings. The exclusive lock is taken before switching to WAL
+            # so SQLite needs no shared-memory file, which Lustre/NFS can't provide.
+            conn.executescript(BULK_LOAD_PRAGMAS)
             cursor = conn.cursor()
             
             # Create schema
@@ -1354,6 +1144,8 @@ Examples:
             insert_scan_data_to_db(cursor, results, args.lustre)
             
             conn.commit()
+            # Leave an ordinary rollback-journal database behind for readers
+            conn.execute("PRAGMA journal_mode=DELETE")
             conn.close()
             
             print(f"Database results written to {args.db}", file=sys.stderr)
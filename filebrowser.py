@@ -249,6 +249,8 @@ class FileBrowser(QMainWindow):
         print("Refreshing application...")
         # Refresh sidebar (which will reload quota information)
         self.sidebar.refresh()
+        # Drop cached metadata so the details view rereads it
+        self.details_view.clear_cache()
         # Refresh file display
         if hasattr(self.file_display, 'refresh'):
             self.file_display.refresh()
@@ -21,6 +21,8 @@ class Sidebar(QWidget):
         self._updating_tree = False  # Flag to prevent recursive operations
         self.add_path_button = None  # Will be created in custom paths widget
         self.quota_info = {}  # Store quota information
+        self._fs_index = None  # (expanded path, file system) pairs, longest path first
+        self._fs_lookup_cache = {}  # path -> file system dict from find_filesystem_for_path
         self.load_custom_paths()  # Load saved custom paths
         self.load_quota_info()  # Load quota information
         self.setup_ui()
@@ -263,6 +265,8 @@ class Sidebar(QWidget):
     
     def refresh(self):
         """Refresh the sidebar contents"""
+        # Resolve paths against the current file systems again
+        self.invalidate_filesystem_lookup()
         # Reload quota information first
         self.load_quota_info()
         # Then repopulate the tree with updated quota info
@@ -398,9 +402,12 @@ class Sidebar(QWidget):
         except Exception as e:
             print(f"Error loading custom paths: {e}")
             self.custom_paths = []
+        self.invalidate_filesystem_lookup()
     
     def save_custom_paths(self):
         """Save custom paths to the configuration file"""
+        # Every change to the custom paths is saved, so drop lookups made with the old list
+        self.invalidate_filesystem_lookup()
         try:
             config_data = {
                 'custom_paths': self.custom_paths
@@ -432,6 +439,8 @@ class Sidebar(QWidget):
                             'name': child_item.text(0),  # Use current display text
                             'path': child_data.get('path', '')
                         })
+                # Renamed or reordered entries change which file system a path resolves to
+                self.invalidate_filesystem_lookup()
                 break
     
     def save_on_close(self):
@@ -504,9 +513,13 @@ class Sidebar(QWidget):
         # Just sync the custom_paths list to match what's displayed in the tree
         self.sync_custom_paths_from_tree() 
 
-    def find_filesystem_for_path(self, path):
-        """Return the file system dict whose path is a prefix of the given path, or None if not found."""
-        # Flatten all file system entries (including custom paths)
+    def invalidate_filesystem_lookup(self):
+        """Forget cached find_filesystem_for_path results after the file systems changed"""
+        self._fs_index = None
+        self._fs_lookup_cache.clear()
+    
+    def _build_filesystem_index(self):
+        """Flatten all file system entries (including custom paths), longest path first"""
         def collect_filesystems(filesystems, out):
             for item in filesystems:
                 if 'category' in item:
@@ -518,12 +531,26 @@ class Sidebar(QWidget):
         # Add custom paths
         for cp in self.custom_paths:
             all_filesystems.append({'name': cp['name'], 'path': cp['path'], 'is_custom': True})
+        index = [(os.path.expanduser(fs.get('path', '')), fs) for fs in all_filesystems]
+        # Stable sort, so among equally long paths the first entry still wins
+        index.sort(key=lambda entry: len(entry[0]), reverse=True)
+        return index
+    
+    def find_filesystem_for_path(self, path):
+        """Return the file system dict whose path is a prefix of the given path, or None if not found."""
+        try:
+            return self._fs_lookup_cache[path]
+        except KeyError:
+            pass
+        if self._fs_index is None:
+            self._fs_index = self._build_filesystem_index()
         # Find the best match (longest prefix)
         best_match = None
-        best_len = -1
-        for fs in all_filesystems:
-            fs_path = os.path.expanduser(fs.get('path', ''))
-            if path.startswith(fs_path) and len(fs_path) > best_len:
+        for fs_path, fs in self._fs_index:
+            if path.startswith(fs_path):
                 best_match = fs
-                best_len = len(fs_path)
-        return best_match 
\ No newline at end of file
+                break
+        if len(self._fs_lookup_cache) >= 1024:
+            self._fs_lookup_cache.clear()
+        self._fs_lookup_cache[path] = best_match
+        return best_match